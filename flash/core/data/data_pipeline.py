@@ -335,7 +335,9 @@ class DataPipeline:
 
     @staticmethod
     def _patch_dataloader(model: "Task", dataloader: Union[Callable, DataLoader], stage: RunningStage):
-        if isinstance(dataloader, DataLoader):
+        # iterables which aren't a ``DataLoader`` (e.g. DALI or SPDL loaders) are patched too, assigning them to the
+        # model directly would break the ``is_overridden`` checks of the ``Trainer``
+        if not callable(dataloader):
             if _PL_GREATER_EQUAL_1_4_3:
                 dataloader = _PatchDataLoader(dataloader, _STAGES_PREFIX[stage])
                 dataloader.patch(model)
@@ -410,6 +412,10 @@ class DataPipeline:
                         del dl_args["batch_sampler"]
                         loader = type(loader)(**dl_args)
 
+                else:
+                    # other iterables already yield collated batches, only the device transforms are attached
+                    device_collate_fn = self._create_collate_preprocessors(stage=stage, is_serving=is_serving)[2]
+
                 dataloader[idx] = loader
 
             # don't have to set attribute if rewrapping device part (happens during detach)
@@ -14,7 +14,7 @@
 import inspect
 import os
 from abc import ABC, abstractclassmethod, abstractmethod
-from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Union
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Type, Union
 
 import torch
 from pytorch_lightning.trainer.states import RunningStage
@@ -26,11 +26,19 @@ import flash
 from flash.core.data.batch import default_uncollate
 from flash.core.data.callback import FlashCallback
 from flash.core.data.data_source import DatasetDataSource, DataSource, DefaultDataKeys, DefaultDataSources
-from flash.core.data.properties import Properties
-from flash.core.data.states import CollateFn
+from flash.core.data.properties import ProcessState, Properties
+from flash.core.data.states import (
+    CollateFn,
+    PerBatchTransformOnDevice,
+    PostTensorTransform,
+    PreTensorTransform,
+    ToTensorTransform,
+)
 from flash.core.data.transforms import ApplyToKeys
 from flash.core.data.utils import _PREPROCESS_FUNCS, _STAGES_PREFIX, convert_to_modules, CurrentRunningStageFuncContext
 
+_TRANSFORM_PROCESS_STATES = (PreTensorTransform, ToTensorTransform, PostTensorTransform, PerBatchTransformOnDevice)
+
 
 class BasePreprocess(ABC):
     @abstractmethod
@@ -188,6 +196,9 @@ class Preprocess(BasePreprocess, Properties):
     ):
         super().__init__()
 
+        # transforms provided through the process states, see ``_resolve_state_transforms``
+        self._state_transforms: Dict[Type[ProcessState], Optional[ProcessState]] = {}
+
         # resolve the default transforms
         train_transform = train_transform or self._resolve_transforms(RunningStage.TRAINING)
         val_transform = val_transform or self._resolve_transforms(RunningStage.VALIDATING)
@@ -347,17 +358,43 @@ class Preprocess(BasePreprocess, Properties):
             return [self.current_transform(s) for s in sample]
         return self.current_transform(sample)
 
+    def set_state(self, state: ProcessState):
+        super().set_state(state)
+        self._resolve_state_transforms()
+
+    def attach_data_pipeline_state(self, data_pipeline_state: "flash.core.data.data_pipeline.DataPipelineState"):
+        super().attach_data_pipeline_state(data_pipeline_state)
+        self._resolve_state_transforms()
+
+    def _resolve_state_transforms(self) -> None:
+        # the states are resolved when they are set or attached rather than for every sample
+        self._state_transforms = {
+            process_state: self.get_state(process_state) for process_state in _TRANSFORM_PROCESS_STATES
+        }
+
+    def _apply_process_state_transform(self, process_state: Type[ProcessState], sample: Any) -> Any:
+        # the model can provide a transform which overrides the transforms of the preprocess.
+        state = self._state_transforms.get(process_state)
+        if state is None:
+            return self._apply_sample_transform(sample)
+        # a state without transform disables the hook, skip it entirely
+        if state.transform is None:
+            return sample
+        if isinstance(sample, list):
+            return [state.transform(s) for s in sample]
+        return state.transform(sample)
+
     def pre_tensor_transform(self, sample: Any) -> Any:
         """Transforms to apply on a single object."""
-        return self._apply_sample_transform(sample)
+        return self._apply_process_state_transform(PreTensorTransform, sample)
 
     def to_tensor_transform(self, sample: Any) -> Tensor:
         """Transforms to convert single object to a tensor."""
-        return self._apply_sample_transform(sample)
+        return self._apply_process_state_transform(ToTensorTransform, sample)
 
     def post_tensor_transform(self, sample: Tensor) -> Tensor:
         """Transforms to apply on a tensor."""
-        return self._apply_sample_transform(sample)
+        return self._apply_process_state_transform(PostTensorTransform, sample)
 
     def per_batch_transform(self, batch: Any) -> Any:
         """Transforms to apply to a whole batch (if possible use this for efficiency).
@@ -411,6 +448,10 @@ class Preprocess(BasePreprocess, Properties):
             This function won't be called within the dataloader workers, since to make that happen
             each of the workers would have to create it's own CUDA-context which would pollute GPU memory (if on GPU).
         """
+        # the model can provide a transform which overrides the transform of the preprocess.
+        state = self._state_transforms.get(PerBatchTransformOnDevice)
+        if state is not None and (state.stages is None or self.running_stage in state.stages):
+            return batch if state.transform is None else state.transform(batch)
         return self.current_transform(batch)
 
     def available_data_sources(self) -> Sequence[str]:
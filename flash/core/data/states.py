@@ -1,5 +1,7 @@
 from dataclasses import dataclass
-from typing import Callable, Optional
+from typing import Callable, Optional, Tuple
+
+from pytorch_lightning.trainer.states import RunningStage
 
 from flash.core.data.properties import ProcessState
 
@@ -26,3 +28,11 @@ class PostTensorTransform(ProcessState):
 class CollateFn(ProcessState):
 
     collate_fn: Optional[Callable] = None
+
+
+@dataclass(unsafe_hash=True, frozen=True)
+class PerBatchTransformOnDevice(ProcessState):
+
+    transform: Optional[Callable] = None
+    # the stages the transform is used for, all of them if ``None``
+    stages: Optional[Tuple[RunningStage, ...]] = None
@@ -47,6 +47,7 @@ class FlashRegistry:
         self.name = name
         self.functions: List[_REGISTERED_FUNCTION] = []
         self._verbose = verbose
+        self._version = 0
 
     def __add__(self, other):
         registries = []
@@ -71,6 +72,11 @@ class FlashRegistry:
     def __repr__(self) -> str:
         return f"{self.__class__.__name__}(name={self.name}, functions={self.functions})"
 
+    @property
+    def version(self) -> int:
+        """Counter incremented every time a function is registered, overridden, or removed."""
+        return self._version
+
     def get(
         self,
         key: str,
@@ -100,6 +106,7 @@ class FlashRegistry:
 
     def remove(self, key: str) -> None:
         self.functions = [f for f in self.functions if f["name"] != key]
+        self._version += 1
 
     def _register_function(
         self,
@@ -136,6 +143,7 @@ class FlashRegistry:
                     " HINT: Use `override=True`."
                 )
             self.functions.append(item)
+        self._version += 1
 
     def _find_matching_index(self, item: _REGISTERED_FUNCTION) -> Optional[int]:
         for idx, fn in enumerate(self.functions):
@@ -246,6 +254,10 @@ class ConcatRegistry(FlashRegistry):
     def __repr__(self) -> str:
         return f"{self.__class__.__name__}(registries={self.registries})"
 
+    @property
+    def version(self) -> int:
+        return sum(registry.version for registry in self.registries)
+
     def get(
         self,
         key: str,
@@ -102,6 +102,9 @@ _TORCH_ORT_AVAILABLE = _module_available("torch_ort")
 _VISSL_AVAILABLE = _module_available("vissl") and _module_available("classy_vision")
 _ALBUMENTATIONS_AVAILABLE = _module_available("albumentations")
 _BAAL_AVAILABLE = _module_available("baal")
+_DALI_AVAILABLE = _module_available("nvidia.dali")
+_SPDL_AVAILABLE = _module_available("spdl")
+_LITDATA_AVAILABLE = _module_available("litdata")
 
 if _PIL_AVAILABLE:
     from PIL import Image  # noqa: F401
@@ -114,6 +117,7 @@ else:
 if Version:
     _TORCHVISION_GREATER_EQUAL_0_9 = _compare_version("torchvision", operator.ge, "0.9.0")
     _PL_GREATER_EQUAL_1_4_3 = _compare_version("pytorch_lightning", operator.ge, "1.4.3")
+    _TORCH_GREATER_EQUAL_1_10 = _compare_version("torch", operator.ge, "1.10.0")
 
 _TEXT_AVAILABLE = all(
     [
@@ -81,6 +81,8 @@ class SimCLRHead(nn.Module):
         return nn.Sequential(*layers)
 
     def forward(self, x: torch.Tensor) -> torch.Tensor:
+        # the output is intentionally not written to a pre-allocated buffer: the projection is differentiable, so
+        # autograd allocates it anyway and copying into a buffer would only add a copy (and break with ``out=``)
         return self.clf(x)
 
 
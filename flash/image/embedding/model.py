@@ -11,20 +11,50 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import contextlib
+import functools
+import os
 import warnings
-from typing import Any, Dict, List, Optional, Type, Union
+import weakref
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Type, Union
 
 import torch
+from pytorch_lightning.trainer.states import RunningStage
+from pytorch_lightning.utilities.exceptions import MisconfigurationException
 from torch.optim.lr_scheduler import _LRScheduler
 
 from flash.core.adapter import AdapterTask
 from flash.core.data.data_source import DefaultDataKeys
-from flash.core.data.states import CollateFn, PostTensorTransform, PreTensorTransform, ToTensorTransform
+from flash.core.data.states import (
+    CollateFn,
+    PerBatchTransformOnDevice,
+    PostTensorTransform,
+    PreTensorTransform,
+    ToTensorTransform,
+)
 from flash.core.data.transforms import ApplyToKeys
 from flash.core.registry import FlashRegistry
-from flash.core.utilities.imports import _VISSL_AVAILABLE
+from flash.core.utilities.imports import _TORCH_GREATER_EQUAL_1_10, _VISSL_AVAILABLE
+
+# the stages which run the pretraining augmentations, the test and predict stages use the data module transforms
+_PRETRAINING_STAGES = (RunningStage.TRAINING, RunningStage.VALIDATING)
+
+
+@functools.lru_cache(None)
+def _lazy_vissl() -> Tuple[FlashRegistry, FlashRegistry, FlashRegistry]:
+    """Import VISSL and build the ``ImageEmbedder`` registries on first use rather than when the module is imported.
+
+    Returns:
+        The training strategies, backbones, and transforms registries.
+    """
+    if not _VISSL_AVAILABLE:
+        return (
+            FlashRegistry("embedder_training_strategies"),
+            FlashRegistry("backbones"),
+            FlashRegistry("embedder_transforms"),
+        )
 
-if _VISSL_AVAILABLE:
     import classy_vision
     import classy_vision.generic.distributed_util
 
@@ -34,16 +64,27 @@ if _VISSL_AVAILABLE:
 
     # patch this to avoid classy vision/vissl based distributed training
     classy_vision.generic.distributed_util.get_world_size = lambda: 1
-else:
-    IMAGE_EMBEDDER_BACKBONES = FlashRegistry("backbones")
-    IMAGE_EMBEDDER_STRATEGIES = FlashRegistry("embedder_training_strategies")
-    IMAGE_EMBEDDER_TRANSFORMS = FlashRegistry("embedder_transforms")
+
+    return IMAGE_EMBEDDER_STRATEGIES, IMAGE_EMBEDDER_BACKBONES, IMAGE_EMBEDDER_TRANSFORMS
+
+
+class _LazyRegistry:
+    """Class level attribute resolving to one of the registries returned by :func:`_lazy_vissl`."""
+
+    def __init__(self, index: int):
+        self.index = index
+
+    def __get__(self, instance: Any, owner: Type) -> FlashRegistry:
+        return _lazy_vissl()[self.index]
 
 
 class ImageEmbedder(AdapterTask):
     """The ``ImageEmbedder`` is a :class:`~flash.Task` for obtaining feature vectors (embeddings) from images. For
     more details, see :ref:`image_embedder`.
 
+    The input sizes are fixed by the pretraining transforms, pass ``benchmark=True`` to the ``Trainer`` to let the
+    cuDNN auto-tuner select the fastest convolution kernels.
+
     Args:
         training_strategy: Training strategy from VISSL,
             select between 'simclr', 'swav', 'dino', 'moco', or 'barlow_twins'.
@@ -51,9 +92,16 @@ class ImageEmbedder(AdapterTask):
             'simclr_head', 'swav_head', 'dino_head', 'moco_head', or 'barlow_twins_head'.
         pretraining_transform: transform applied to input image for pre-training SSL model.
             Select between 'simclr_transform', 'swav_transform', 'dino_transform',
-            'moco_transform', or 'barlow_twins_transform'.
+            'moco_transform', or 'barlow_twins_transform'. Append ``_gpu`` (e.g. 'simclr_transform_gpu') to only
+            resize the images in the data loader and extract the crops on device with Kornia, ``_u8`` (e.g.
+            'simclr_transform_u8') to do the same while transferring ``uint8`` images, or ``_dali`` (e.g.
+            'simclr_transform_dali') to decode and crop the images with NVIDIA DALI instead of a ``DataLoader``, or
+            ``_litdata`` (e.g. 'simclr_transform_litdata') to stream images cached with :meth:`cache_to_litdata`.
+            The transforms extracting the crops on device replace the ``per_batch_transform_on_device`` of the data
+            module, use their ``normalize`` (or ``mean`` and ``std``) argument to normalize the crops.
         backbone: VISSL backbone, defaults to ``resnet``.
-        pretrained: Use a pretrained backbone, defaults to ``False``.
+        pretrained: Use a pretrained backbone, defaults to ``False``. The VISSL backbones are always randomly
+            initialized (no weights are downloaded) as they are meant to be trained with a self-supervised strategy.
         optimizer: Optimizer to use for training and finetuning, defaults to :class:`torch.optim.SGD`.
         optimizer_kwargs: Additional kwargs to use when creating the optimizer (if not passed as an instance).
         scheduler: The scheduler or scheduler class to use.
@@ -62,14 +110,22 @@ class ImageEmbedder(AdapterTask):
         backbone_kwargs: arguments to be passed to VISSL backbones, i.e. ``vision_transformer`` and ``resnet``.
         training_strategy_kwargs: arguments passed to VISSL loss function, projection head and training hooks.
         pretraining_transform_kwargs: arguments passed to VISSL transforms.
+        precision: Run the forward passes under ``torch.autocast`` with ``bfloat16`` when set to ``"bf16"`` (the
+            default, ``"bf16-mixed"`` is accepted too) and the GPU supports it. Ignored when the ``Trainer`` already
+            uses mixed precision, set to ``None`` to train in full precision.
+        compile: Compile the backbone and head with ``torch.compile`` (requires PyTorch 2.0 or later).
     """
 
-    training_strategies: FlashRegistry = IMAGE_EMBEDDER_STRATEGIES
-    backbones: FlashRegistry = IMAGE_EMBEDDER_BACKBONES
-    transforms: FlashRegistry = IMAGE_EMBEDDER_TRANSFORMS
+    training_strategies: FlashRegistry = _LazyRegistry(0)
+    backbones: FlashRegistry = _LazyRegistry(1)
+    transforms: FlashRegistry = _LazyRegistry(2)
 
     required_extras: str = "image"
 
+    __registry_cache__: "weakref.WeakKeyDictionary[FlashRegistry, Tuple[int, Dict[Tuple, Any]]]" = (
+        weakref.WeakKeyDictionary()
+    )
+
     def __init__(
         self,
         training_strategy: str,
@@ -85,18 +141,25 @@ class ImageEmbedder(AdapterTask):
         backbone_kwargs: Optional[Dict[str, Any]] = None,
         training_strategy_kwargs: Optional[Dict[str, Any]] = None,
         pretraining_transform_kwargs: Optional[Dict[str, Any]] = None,
+        precision: Optional[str] = "bf16",
+        compile: bool = False,
     ):
         self.save_hyperparameters()
 
+        if precision == "bf16-mixed":
+            precision = "bf16"
+        if precision not in (None, "bf16"):
+            raise MisconfigurationException(f"`precision` should be either None or 'bf16', got {precision!r}.")
+
         if backbone_kwargs is None:
             backbone_kwargs = {}
 
         if training_strategy_kwargs is None:
             training_strategy_kwargs = {}
 
-        backbone, _ = self.backbones.get(backbone)(pretrained=pretrained, **backbone_kwargs)
+        backbone, _ = self._cached_get(self.backbones, backbone)(pretrained=pretrained, **backbone_kwargs)
 
-        metadata = self.training_strategies.get(training_strategy, with_metadata=True)
+        metadata = self._cached_get(self.training_strategies, training_strategy, with_metadata=True)
         loss_fn, head, hooks = metadata["fn"](head=head, **training_strategy_kwargs)
 
         adapter = metadata["metadata"]["adapter"].from_task(
@@ -107,6 +170,15 @@ class ImageEmbedder(AdapterTask):
             hooks=hooks,
         )
 
+        if compile:
+            if hasattr(torch, "compile"):
+                # compile the ``forward`` methods rather than the modules to keep the ``state_dict`` keys unchanged,
+                # the heads are compiled separately to avoid recompiling the backbone when the projection changes
+                for module in [adapter.backbone, *adapter.head]:
+                    module.forward = torch.compile(module.forward, mode="max-autotune", dynamic=False)
+            else:
+                warnings.warn("`torch.compile` requires PyTorch 2.0 or later, the backbone will run in eager mode.")
+
         super().__init__(
             adapter=adapter,
             optimizer=optimizer,
@@ -116,14 +188,46 @@ class ImageEmbedder(AdapterTask):
             learning_rate=learning_rate,
         )
 
-        transform, collate_fn = self.transforms.get(pretraining_transform)(**pretraining_transform_kwargs)
-        to_tensor_transform = ApplyToKeys(
-            DefaultDataKeys.INPUT,
-            transform,
-        )
+        # ``precision`` is already an attribute of the ``LightningModule`` set by the ``Trainer``
+        self.autocast_precision = precision
+
+        # set by ``to_torchscript``, not registered as a sub-module so that it isn't part of the ``state_dict``
+        self.__dict__["_traced_backbone"] = None
+        self.__dict__["_traced_device"] = None
+
+        transforms = self._cached_get(self.transforms, pretraining_transform)(**pretraining_transform_kwargs)
+        # the transforms extracting the crops for the whole batch on device also return that batch transform, it
+        # replaces the ``per_batch_transform_on_device`` of the data module while pretraining (the adapter holds it as
+        # a sub-module to move it to the device of the model)
+        transform, collate_fn, *gpu_transform = transforms
+        if gpu_transform:
+            self.adapter.gpu_transform = gpu_transform[0]
+            self.adapter.set_state(PerBatchTransformOnDevice(self.adapter.gpu_transform, stages=_PRETRAINING_STAGES))
+
+        if hasattr(transform, "dali_pipeline"):
+            # decoding and cropping happen in the DALI pipeline which replaces the data loader
+            self.adapter.dali_transform = transform
+            self.adapter.dali_collate_fn = collate_fn
+            # the crops are already normalized by the pipeline
+            self.adapter.set_state(PerBatchTransformOnDevice(None, stages=_PRETRAINING_STAGES))
+        elif hasattr(transform, "streaming_dataloader"):
+            # the images are read pre-decoded from the LitData chunks, no per sample transform or collate is needed
+            self.adapter.litdata_transform = transform
+        else:
+            to_tensor_transform = ApplyToKeys(
+                DefaultDataKeys.INPUT,
+                transform,
+            )
+
+            self.adapter.set_state(CollateFn(collate_fn))
+            self.adapter.set_state(ToTensorTransform(to_tensor_transform))
+
+        # each sample holds several augmented views, so keep more batches in flight per worker
+        self.adapter.dataloader_kwargs = {"prefetch_factor": 4}
+
+        # FLASH_USE_SPDL can be set to load the training data with an SPDL pipeline instead of a ``DataLoader``.
+        self.adapter.use_spdl = os.getenv("FLASH_USE_SPDL", "0") == "1"
 
-        self.adapter.set_state(CollateFn(collate_fn))
-        self.adapter.set_state(ToTensorTransform(to_tensor_transform))
         self.adapter.set_state(PostTensorTransform(None))
         self.adapter.set_state(PreTensorTransform(None))
 
@@ -132,7 +236,97 @@ class ImageEmbedder(AdapterTask):
             " with pre-defined transforms for the training strategy."
         )
 
+    def _autocast(self):
+        if (
+            self.autocast_precision == "bf16"
+            and getattr(self.trainer, "precision", 32) == 32
+            and self.device.type == "cuda"
+            and _TORCH_GREATER_EQUAL_1_10
+            and torch.cuda.is_bf16_supported()
+        ):
+            return torch.autocast(device_type="cuda", dtype=torch.bfloat16)
+        return contextlib.nullcontext()
+
+    def forward(self, x: torch.Tensor) -> Any:
+        with self._autocast():
+            return super().forward(x)
+
+    def training_step(self, batch: Any, batch_idx: int) -> Any:
+        with self._autocast():
+            return super().training_step(batch, batch_idx)
+
+    def validation_step(self, batch: Any, batch_idx: int) -> None:
+        with self._autocast():
+            return super().validation_step(batch, batch_idx)
+
+    def test_step(self, batch: Any, batch_idx: int) -> None:
+        with self._autocast():
+            return super().test_step(batch, batch_idx)
+
+    def predict_step(self, batch: Any, batch_idx: int, dataloader_idx: int = 0) -> Any:
+        # the frozen module holds a copy of the weights, it is only valid on the device it was exported on
+        if self._traced_backbone is not None and self._traced_device == self.device:
+            return self._traced_backbone(self.adapter._to_memory_format(batch[DefaultDataKeys.INPUT]))
+        with self._autocast():
+            return super().predict_step(batch, batch_idx, dataloader_idx=dataloader_idx)
+
+    @torch.no_grad()
+    def to_torchscript(
+        self,
+        file_path: Optional[Union[str, Path]] = None,
+        method: Optional[str] = "trace",
+        example_inputs: Optional[torch.Tensor] = None,
+        **kwargs,
+    ) -> torch.jit.ScriptModule:
+        """Export the backbone (without the SSL projection head) with TorchScript for extracting embeddings. The
+        exported module is frozen, optimized for inference and used by ``predict_step`` until the weights change
+        (training or loading a ``state_dict``) or the model is moved to another device.
+
+        Args:
+            file_path: Path to save the exported module to.
+            method: Either ``"trace"`` (default) or ``"script"``. Vision transformers are always scripted as
+                tracing them in ``eval`` mode gives incorrect results.
+            example_inputs: Input used for tracing, defaults to a random ``(1, 3, 224, 224)`` image batch.
+            kwargs: Additional arguments passed to ``torch.jit.trace`` or ``torch.jit.script``.
+        """
+        from flash.image.embedding.vissl.adapter import VISSLTrunkFeatures
+
+        mode = self.training
+        self.eval()
+
+        backbone = VISSLTrunkFeatures(self.adapter.backbone)
+        if method == "trace" and self.adapter.channels_last:
+            if example_inputs is None:
+                example_inputs = torch.randn(1, 3, 224, 224, device=self.device)
+            torchscript_module = torch.jit.trace(
+                backbone, self.adapter._to_memory_format(example_inputs.to(self.device)), **kwargs
+            )
+        else:
+            torchscript_module = torch.jit.script(backbone, **kwargs)
+
+        torchscript_module = torch.jit.freeze(torchscript_module)
+        if _TORCH_GREATER_EQUAL_1_10:
+            torchscript_module = torch.jit.optimize_for_inference(torchscript_module)
+
+        self.train(mode)
+        self.__dict__["_traced_backbone"] = torchscript_module
+        self.__dict__["_traced_device"] = self.device
+
+        if file_path is not None:
+            torch.jit.save(torchscript_module, file_path)
+
+        return torchscript_module
+
+    def _clear_torchscript(self) -> None:
+        self.__dict__["_traced_backbone"] = None
+        self.__dict__["_traced_device"] = None
+
+    def load_state_dict(self, *args, **kwargs) -> Any:
+        self._clear_torchscript()
+        return super().load_state_dict(*args, **kwargs)
+
     def on_train_start(self) -> None:
+        self._clear_torchscript()
         self.adapter.on_train_start()
 
     def on_train_epoch_end(self) -> None:
@@ -141,6 +335,63 @@ class ImageEmbedder(AdapterTask):
     def on_train_batch_end(self, outputs: Any, batch: Any, batch_idx: int, dataloader_idx: int) -> None:
         self.adapter.on_train_batch_end(outputs, batch, batch_idx, dataloader_idx)
 
+    @staticmethod
+    def cache_to_litdata(
+        root: str,
+        output_dir: str,
+        image_size: int = 256,
+        chunk_bytes: str = "64MB",
+        num_workers: int = 1,
+    ) -> None:
+        """Decode and resize the images of the folder dataset in ``root`` once and write them as LitData chunks to
+        ``output_dir``. Pass ``output_dir`` as ``input_dir`` to a ``_litdata`` pretraining transform to train from
+        the cache.
+
+        Args:
+            root: Folder containing one sub-folder of images per class.
+            output_dir: Folder to write the chunks to.
+            image_size: Size the images are resized to (height = width).
+            chunk_bytes: Size of each chunk.
+            num_workers: Number of processes used to fill the cache.
+        """
+        from flash.image.embedding.transforms.litdata_transforms import optimize_image_folder
+
+        optimize_image_folder(
+            root,
+            output_dir,
+            image_size=image_size,
+            chunk_bytes=chunk_bytes,
+            num_workers=num_workers,
+        )
+
+    @classmethod
+    def _cached_get(cls, registry: FlashRegistry, key: str, with_metadata: bool = False, **metadata) -> Any:
+        """Memoized version of :meth:`~flash.core.registry.FlashRegistry.get`.
+
+        The lookups are memoized per registry for its current version only, so that registered, overridden, or
+        removed entries are picked up without an explicit call to :meth:`clear_registry_cache`. The registries are
+        weakly referenced and their lookups are dropped when they are garbage collected.
+        """
+        cache_key = (key, with_metadata, tuple(sorted(metadata.items())))
+        try:
+            hash(cache_key)
+        except TypeError:
+            # metadata filters with unhashable values can't be cached
+            return registry.get(key, with_metadata=with_metadata, **metadata)
+
+        version, lookups = cls.__registry_cache__.get(registry, (None, None))
+        if version != registry.version:
+            lookups = {}
+            cls.__registry_cache__[registry] = (registry.version, lookups)
+        if cache_key not in lookups:
+            lookups[cache_key] = registry.get(key, with_metadata=with_metadata, **metadata)
+        return lookups[cache_key]
+
+    @classmethod
+    def clear_registry_cache(cls) -> None:
+        """Clear the cache of registry lookups, e.g. after overriding or removing a registered function."""
+        cls.__registry_cache__.clear()
+
     @classmethod
     def available_training_strategies(cls) -> List[str]:
         registry: Optional[FlashRegistry] = getattr(cls, "training_strategies", None)
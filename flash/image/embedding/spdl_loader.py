@@ -0,0 +1,109 @@
+# Copyright The PyTorch Lightning team.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import copy
+from typing import Any, Callable, Iterator, Optional
+
+from torch.utils.data import DistributedSampler, RandomSampler, Sampler, SequentialSampler
+
+from flash.core.data.auto_dataset import BaseAutoDataset
+from flash.core.utilities.imports import _SPDL_AVAILABLE, requires
+
+if _SPDL_AVAILABLE:
+    from spdl.pipeline import PipelineBuilder
+
+
+class SPDLPipelineIterable:
+    """Iterable which loads the batches of a dataset with an `SPDL <https://github.com/facebookresearch/spdl>`_
+    pipeline instead of a ``DataLoader``. The pipeline runs in a pool of threads of the current process, no process
+    pool is used: the samples are loaded (decoded) concurrently, aggregated into batches and the per sample transforms
+    and collation run on one batch at a time. The running stage of the preprocess is not thread local, so the batches
+    are collated sequentially with a copy of the collate function which is not shared with the training loop.
+
+    Args:
+        dataset: The dataset to load samples from.
+        collate_fn: The collate function of the data pipeline, including the per sample transforms.
+        batch_size: The number of samples per batch.
+        num_threads: The number of threads used by the pipeline.
+        decode_concurrency: The number of samples loaded concurrently.
+        shuffle: Whether to shuffle the samples at each epoch.
+        drop_last: Whether to drop the last batch if it is incomplete.
+        buffer_size: The number of batches buffered ahead of the training loop.
+        sampler: The sampler drawing the indices of the samples, defaults to a ``DistributedSampler`` when
+            ``num_replicas > 1`` and to a random or sequential sampler otherwise.
+        num_replicas: The number of processes taking part in distributed training.
+        rank: The rank of the current process.
+    """
+
+    @requires("spdl")
+    def __init__(
+        self,
+        dataset: BaseAutoDataset,
+        collate_fn: Callable,
+        batch_size: int,
+        num_threads: int = 8,
+        decode_concurrency: int = 8,
+        shuffle: bool = False,
+        drop_last: bool = True,
+        buffer_size: int = 3,
+        sampler: Optional[Sampler] = None,
+        num_replicas: int = 1,
+        rank: int = 0,
+    ):
+        self.dataset = dataset
+        self.collate_fn = copy.deepcopy(collate_fn)
+        self.batch_size = batch_size
+        self.num_threads = num_threads
+        self.decode_concurrency = decode_concurrency
+        self.shuffle = shuffle
+        self.drop_last = drop_last
+        self.buffer_size = buffer_size
+
+        if sampler is None:
+            if num_replicas > 1:
+                # the ``Trainer`` only replaces the sampler of a ``DataLoader``, so each process loads its own shard
+                sampler = DistributedSampler(dataset, num_replicas=num_replicas, rank=rank, shuffle=shuffle)
+            elif shuffle:
+                sampler = RandomSampler(dataset)
+            else:
+                sampler = SequentialSampler(dataset)
+        self.sampler = sampler
+        self._epoch = 0
+
+    def __len__(self) -> int:
+        if self.drop_last:
+            return len(self.sampler) // self.batch_size
+        return (len(self.sampler) + self.batch_size - 1) // self.batch_size
+
+    def _indices(self) -> Iterator[int]:
+        if hasattr(self.sampler, "set_epoch"):
+            # shuffle differently at every epoch, with the same order in all the processes
+            self.sampler.set_epoch(self._epoch)
+        self._epoch += 1
+        return iter(self.sampler)
+
+    def _build_pipeline(self):
+        return (
+            PipelineBuilder()
+            .add_source(self._indices())
+            .pipe(self.dataset.__getitem__, concurrency=self.decode_concurrency)
+            .aggregate(self.batch_size, drop_last=self.drop_last)
+            .pipe(self.collate_fn, concurrency=1)
+            .add_sink(self.buffer_size)
+            .build(num_threads=self.num_threads)
+        )
+
+    def __iter__(self) -> Iterator[Any]:
+        pipeline = self._build_pipeline()
+        with pipeline.auto_stop():
+            yield from pipeline
@@ -0,0 +1,250 @@
+# Copyright The PyTorch Lightning team.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from flash.core.data.data_source import DefaultDataKeys
+from flash.core.registry import FlashRegistry
+from flash.core.utilities.imports import _DALI_AVAILABLE, requires
+from flash.image.embedding.vissl.transforms import moco_gpu_collate_fn, multicrop_gpu_collate_fn, simclr_gpu_collate_fn
+
+if _DALI_AVAILABLE:
+    import nvidia.dali.fn as fn
+    import nvidia.dali.types as types
+    from nvidia.dali import pipeline_def
+    from nvidia.dali.plugin.pytorch import DALIGenericIterator, LastBatchPolicy
+
+# by default only scale to [0, 1] like ``ToTensor`` in the ``StandardMultiCropSSLTransform``
+_DEFAULT_MEAN = [0.0, 0.0, 0.0]
+_DEFAULT_STD = [255.0, 255.0, 255.0]
+
+
+def _random_apply(transformed, images, probability: float):
+    coin = fn.random.coin_flip(probability=probability)
+    return fn.cast(coin * transformed + (1 - coin) * images, dtype=types.UINT8)
+
+
+class DALIMultiCropSSLTransform:
+    """Decodes and crops the images with `NVIDIA DALI <https://github.com/NVIDIA/DALI>`_. JPEG decoding happens on
+    the GPU (``device="mixed"``) and every crop is produced by its own branch of the DALI pipeline, replacing the
+    PyTorch ``DataLoader`` for the pretraining stages.
+
+    Args:
+        total_num_crops (int): Total number of crops to extract
+        num_crops (List or Tuple of ints): Specifies the number of `type' of crops.
+        size_crops (List or Tuple of ints): Specifies the height (height = width)
+                                            of each patch
+        crop_scales (List or Tuple containing [float, float]): Scale of the crop
+        gaussian_blur (bool): Specifies if the transforms composition has Gaussian Blur
+        jitter_strength (float): Specify the coefficient for color jitter transform
+        mean (List of floats): Per channel mean, in pixel values, used for normalization
+        std (List of floats): Per channel standard deviation, in pixel values, used for normalization
+    """
+
+    @requires("nvidia.dali")
+    def __init__(
+        self,
+        total_num_crops: int,
+        num_crops: Sequence[int],
+        size_crops: Sequence[int],
+        crop_scales: Sequence[Sequence[float]],
+        gaussian_blur: bool = True,
+        jitter_strength: float = 1.0,
+        mean: Sequence[float] = _DEFAULT_MEAN,
+        std: Sequence[float] = _DEFAULT_STD,
+    ):
+        assert np.sum(num_crops) == total_num_crops
+        assert len(size_crops) == len(num_crops)
+        assert len(size_crops) == len(crop_scales)
+
+        self.total_num_crops = total_num_crops
+        self.crops = [(size, scale) for num, size, scale in zip(num_crops, size_crops, crop_scales) for _ in range(num)]
+        self.gaussian_blur = gaussian_blur
+        self.jitter_strength = jitter_strength
+        self.mean = list(mean)
+        self.std = list(std)
+
+        kernel_size = int(0.1 * size_crops[0])
+        if kernel_size % 2 == 0:
+            kernel_size += 1
+        self.kernel_size = kernel_size
+
+    @property
+    def output_map(self) -> List[str]:
+        return [f"view{idx}" for idx in range(self.total_num_crops)] + [DefaultDataKeys.TARGET.value]
+
+    def _augment(self, images, size: int, scale: Sequence[float]):
+        images = fn.random_resized_crop(images, size=(size, size), random_area=list(scale))
+
+        jitter = 0.8 * self.jitter_strength
+        # DALI rotates the hue in degrees, the hue factor of ``ColorJitter`` is a fraction of the full turn
+        color_jittered = fn.color_twist(
+            images,
+            brightness=fn.random.uniform(range=[1 - jitter, 1 + jitter]),
+            contrast=fn.random.uniform(range=[1 - jitter, 1 + jitter]),
+            saturation=fn.random.uniform(range=[1 - jitter, 1 + jitter]),
+            hue=fn.random.uniform(range=[-0.2 * self.jitter_strength * 360, 0.2 * self.jitter_strength * 360]),
+        )
+        images = _random_apply(color_jittered, images, 0.8)
+        images = _random_apply(fn.color_twist(images, saturation=0.0), images, 0.2)
+
+        if self.gaussian_blur:
+            blurred = fn.gaussian_blur(images, window_size=self.kernel_size, sigma=fn.random.uniform(range=[0.1, 2.0]))
+            images = _random_apply(blurred, images, 0.5)
+
+        return fn.crop_mirror_normalize(
+            images,
+            dtype=types.FLOAT,
+            output_layout="CHW",
+            mean=self.mean,
+            std=self.std,
+            mirror=fn.random.coin_flip(probability=0.5),
+        )
+
+    def dali_pipeline(
+        self,
+        files: List[str],
+        labels: List[int],
+        batch_size: int,
+        num_threads: int,
+        device_id: int,
+        shard_id: int = 0,
+        num_shards: int = 1,
+        shuffle: bool = True,
+    ):
+        """Build the DALI pipeline reading ``files`` and returning one output per crop and the targets."""
+
+        @pipeline_def(batch_size=batch_size, num_threads=num_threads, device_id=device_id)
+        def _pipeline():
+            jpegs, targets = fn.readers.file(
+                files=files,
+                labels=labels,
+                random_shuffle=shuffle,
+                shard_id=shard_id,
+                num_shards=num_shards,
+                name="Reader",
+            )
+            images = fn.decoders.image(jpegs, device="mixed", output_type=types.RGB)
+            crops = [self._augment(images, size, scale) for size, scale in self.crops]
+            return (*crops, targets.gpu())
+
+        return _pipeline()
+
+
+class DALIDataLoader:
+    """Iterable wrapping a ``DALIGenericIterator`` which yields batches in the layout of the VISSL collate
+    functions."""
+
+    def __init__(self, pipeline, output_map: List[str], collate_fn: Callable, drop_last: bool = True):
+        pipeline.build()
+        self.iterator = DALIGenericIterator(
+            [pipeline],
+            output_map,
+            reader_name="Reader",
+            last_batch_policy=LastBatchPolicy.DROP if drop_last else LastBatchPolicy.PARTIAL,
+            auto_reset=True,
+        )
+        self.output_map = output_map
+        self.collate_fn = collate_fn
+
+    def __len__(self) -> int:
+        return len(self.iterator)
+
+    def __iter__(self):
+        for outputs in self.iterator:
+            outputs = outputs[0]
+            batch: Dict[str, Any] = {DefaultDataKeys.TARGET: outputs[DefaultDataKeys.TARGET.value].view(-1).long()}
+            yield self.collate_fn(batch, [outputs[key] for key in self.output_map[:-1]])
+
+
+def simclr_transform_dali(
+    total_num_crops: int = 2,
+    num_crops: Sequence[int] = [2],
+    size_crops: Sequence[int] = [224],
+    crop_scales: Sequence[Sequence[float]] = [[0.4, 1]],
+    gaussian_blur: bool = True,
+    jitter_strength: float = 1.0,
+    mean: Optional[Sequence[float]] = None,
+    std: Optional[Sequence[float]] = None,
+    collate_fn: Callable = simclr_gpu_collate_fn,
+) -> Tuple[DALIMultiCropSSLTransform, Callable]:
+    """For simclr, barlow twins and moco."""
+    transform = DALIMultiCropSSLTransform(
+        total_num_crops=total_num_crops,
+        num_crops=num_crops,
+        size_crops=size_crops,
+        crop_scales=crop_scales,
+        gaussian_blur=gaussian_blur,
+        jitter_strength=jitter_strength,
+        mean=mean or _DEFAULT_MEAN,
+        std=std or _DEFAULT_STD,
+    )
+
+    return transform, collate_fn
+
+
+def swav_transform_dali(
+    total_num_crops: int = 8,
+    num_crops: Sequence[int] = [2, 6],
+    size_crops: Sequence[int] = [224, 96],
+    crop_scales: Sequence[Sequence[float]] = [[0.4, 1], [0.05, 0.4]],
+    gaussian_blur: bool = True,
+    jitter_strength: float = 1.0,
+    mean: Optional[Sequence[float]] = None,
+    std: Optional[Sequence[float]] = None,
+    collate_fn: Callable = multicrop_gpu_collate_fn,
+) -> Tuple[DALIMultiCropSSLTransform, Callable]:
+    """For swav and dino."""
+    return simclr_transform_dali(
+        total_num_crops=total_num_crops,
+        num_crops=num_crops,
+        size_crops=size_crops,
+        crop_scales=crop_scales,
+        gaussian_blur=gaussian_blur,
+        jitter_strength=jitter_strength,
+        mean=mean,
+        std=std,
+        collate_fn=collate_fn,
+    )
+
+
+barlow_twins_transform_dali = partial(simclr_transform_dali, collate_fn=simclr_gpu_collate_fn)
+moco_transform_dali = partial(simclr_transform_dali, collate_fn=moco_gpu_collate_fn)
+dino_transform_dali = partial(
+    swav_transform_dali, total_num_crops=10, num_crops=[2, 8], collate_fn=multicrop_gpu_collate_fn
+)
+
+
+transforms = [
+    "simclr_transform_dali",
+    "swav_transform_dali",
+    "barlow_twins_transform_dali",
+    "moco_transform_dali",
+    "dino_transform_dali",
+]
+
+
+def register_dali_transforms(register: FlashRegistry):
+    for idx, transform in enumerate(
+        (
+            simclr_transform_dali,
+            swav_transform_dali,
+            barlow_twins_transform_dali,
+            moco_transform_dali,
+            dino_transform_dali,
+        )
+    ):
+        register(transform, name=transforms[idx])
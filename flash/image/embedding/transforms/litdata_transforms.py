@@ -0,0 +1,185 @@
+# Copyright The PyTorch Lightning team.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from functools import partial
+from typing import Any, Callable, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+import torch
+import torch.nn as nn
+
+from flash.core.data.data_source import DefaultDataKeys, make_dataset, PathsDataSource
+from flash.core.data.transforms import ApplyToKeys
+from flash.core.registry import FlashRegistry
+from flash.core.utilities.imports import _LITDATA_AVAILABLE, requires
+from flash.image.data import image_loader, IMG_EXTENSIONS
+from flash.image.embedding.vissl.transforms import (
+    KorniaMultiCropSSLTransform,
+    moco_gpu_collate_fn,
+    multicrop_gpu_collate_fn,
+    simclr_gpu_collate_fn,
+)
+
+if _LITDATA_AVAILABLE:
+    import litdata
+
+
+def litdata_preprocess(sample: Tuple[str, int], image_size: int = 256) -> Dict[str, Any]:
+    """Decode and resize a single image once, the result is stored as an ``uint8`` tensor in ``CHW`` layout."""
+    path, target = sample
+    image = image_loader(path).convert("RGB").resize((image_size, image_size))
+    image = torch.from_numpy(np.asarray(image).copy()).permute(2, 0, 1).contiguous()
+    return {DefaultDataKeys.INPUT.value: image, DefaultDataKeys.TARGET.value: target}
+
+
+@requires("litdata")
+def optimize_image_folder(
+    root: str,
+    output_dir: str,
+    image_size: int = 256,
+    chunk_bytes: str = "64MB",
+    num_workers: int = 1,
+) -> None:
+    """Materialize the images of a folder dataset (one sub-folder per class) as LitData chunks in ``output_dir``."""
+    _, class_to_idx = PathsDataSource.find_classes(root)
+    litdata.optimize(
+        fn=partial(litdata_preprocess, image_size=image_size),
+        inputs=make_dataset(root, class_to_idx, extensions=IMG_EXTENSIONS),
+        output_dir=output_dir,
+        chunk_bytes=chunk_bytes,
+        num_workers=num_workers,
+    )
+
+
+def _to_float(image: torch.Tensor) -> torch.Tensor:
+    # the validation images come from the ``DataLoader`` of the data module and are already scaled to [0, 1]
+    if image.dtype != torch.uint8:
+        return image
+    return image.float().div_(255)
+
+
+class _StreamingLoader:
+    """Iterable over a ``litdata.StreamingDataLoader``.
+
+    The data pipeline re-instantiates any ``DataLoader`` with its own collate function, which would fail for the
+    ``StreamingDataLoader`` and run the data module transforms on the pre-decoded images. Wrapped, only the device
+    transforms are attached to the streamed batches.
+    """
+
+    def __init__(self, dataloader: "litdata.StreamingDataLoader"):
+        self.dataloader = dataloader
+
+    def __len__(self) -> int:
+        return len(self.dataloader)
+
+    def __iter__(self):
+        return iter(self.dataloader)
+
+
+class LitDataSSLTransform:
+    """Streams the pre-decoded images written by :func:`optimize_image_folder` from ``input_dir``, replacing the
+    ``DataLoader`` of the training stage.
+
+    The validation stage still uses the ``DataLoader`` of the data module.
+    """
+
+    @requires("litdata")
+    def __init__(self, input_dir: str):
+        self.input_dir = input_dir
+
+    def streaming_dataloader(self, batch_size: int, num_workers: int, shuffle: bool, drop_last: bool):
+        dataset = litdata.StreamingDataset(self.input_dir, shuffle=shuffle, drop_last=drop_last)
+        return _StreamingLoader(litdata.StreamingDataLoader(dataset, batch_size=batch_size, num_workers=num_workers))
+
+
+def simclr_transform_litdata(
+    input_dir: str,
+    total_num_crops: int = 2,
+    num_crops: Sequence[int] = [2],
+    size_crops: Sequence[int] = [224],
+    crop_scales: Sequence[Sequence[float]] = [[0.4, 1]],
+    gaussian_blur: bool = True,
+    jitter_strength: float = 1.0,
+    normalize: Optional[nn.Module] = None,
+    collate_fn: Callable = simclr_gpu_collate_fn,
+) -> Tuple[LitDataSSLTransform, None, nn.Module]:
+    """For simclr, barlow twins and moco."""
+    gpu_transform = nn.Sequential(
+        ApplyToKeys(DefaultDataKeys.INPUT, _to_float),
+        KorniaMultiCropSSLTransform(
+            total_num_crops=total_num_crops,
+            num_crops=num_crops,
+            size_crops=size_crops,
+            crop_scales=crop_scales,
+            collate_fn=collate_fn,
+            gaussian_blur=gaussian_blur,
+            jitter_strength=jitter_strength,
+            normalize=normalize,
+        ),
+    )
+
+    return LitDataSSLTransform(input_dir), None, gpu_transform
+
+
+def swav_transform_litdata(
+    input_dir: str,
+    total_num_crops: int = 8,
+    num_crops: Sequence[int] = [2, 6],
+    size_crops: Sequence[int] = [224, 96],
+    crop_scales: Sequence[Sequence[float]] = [[0.4, 1], [0.05, 0.4]],
+    gaussian_blur: bool = True,
+    jitter_strength: float = 1.0,
+    normalize: Optional[nn.Module] = None,
+    collate_fn: Callable = multicrop_gpu_collate_fn,
+) -> Tuple[LitDataSSLTransform, None, nn.Module]:
+    """For swav and dino."""
+    return simclr_transform_litdata(
+        input_dir,
+        total_num_crops=total_num_crops,
+        num_crops=num_crops,
+        size_crops=size_crops,
+        crop_scales=crop_scales,
+        gaussian_blur=gaussian_blur,
+        jitter_strength=jitter_strength,
+        normalize=normalize,
+        collate_fn=collate_fn,
+    )
+
+
+barlow_twins_transform_litdata = partial(simclr_transform_litdata, collate_fn=simclr_gpu_collate_fn)
+moco_transform_litdata = partial(simclr_transform_litdata, collate_fn=moco_gpu_collate_fn)
+dino_transform_litdata = partial(
+    swav_transform_litdata, total_num_crops=10, num_crops=[2, 8], collate_fn=multicrop_gpu_collate_fn
+)
+
+
+transforms = [
+    "simclr_transform_litdata",
+    "swav_transform_litdata",
+    "barlow_twins_transform_litdata",
+    "moco_transform_litdata",
+    "dino_transform_litdata",
+]
+
+
+def register_litdata_transforms(register: FlashRegistry):
+    for idx, transform in enumerate(
+        (
+            simclr_transform_litdata,
+            swav_transform_litdata,
+            barlow_twins_transform_litdata,
+            moco_transform_litdata,
+            dino_transform_litdata,
+        )
+    ):
+        register(transform, name=transforms[idx])
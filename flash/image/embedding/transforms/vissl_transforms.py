@@ -12,17 +12,36 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 from functools import partial
-from typing import Callable, Optional, Sequence
+from typing import Callable, Optional, Sequence, Tuple
 
+import numpy as np
+import torch
 import torch.nn as nn
 
+from flash.core.data.data_source import DefaultDataKeys
+from flash.core.data.transforms import ApplyToKeys, kornia_collate
 from flash.core.registry import FlashRegistry
-from flash.core.utilities.imports import _VISSL_AVAILABLE
-from flash.image.embedding.vissl.transforms import moco_collate_fn, multicrop_collate_fn, simclr_collate_fn
+from flash.core.utilities.imports import _KORNIA_AVAILABLE, _TORCHVISION_AVAILABLE, _VISSL_AVAILABLE
+from flash.image.embedding.vissl.transforms import (
+    KorniaMultiCropSSLTransform,
+    moco_collate_fn,
+    moco_gpu_collate_fn,
+    multicrop_collate_fn,
+    multicrop_gpu_collate_fn,
+    simclr_collate_fn,
+    simclr_gpu_collate_fn,
+    UInt8ToFloat,
+)
 
 if _VISSL_AVAILABLE:
     from classy_vision.dataset.transforms import TRANSFORM_REGISTRY
 
+if _TORCHVISION_AVAILABLE:
+    import torchvision.transforms as pth_transforms
+
+if _KORNIA_AVAILABLE:
+    import kornia as K
+
 
 def simclr_transform(
     total_num_crops: int = 2,
@@ -77,12 +96,164 @@ moco_transform = partial(simclr_transform, collate_fn=moco_collate_fn)
 dino_transform = partial(swav_transform, total_num_crops=10, num_crops=[2, 8], collate_fn=multicrop_collate_fn)
 
 
+def simclr_transform_gpu(
+    total_num_crops: int = 2,
+    num_crops: Sequence[int] = [2],
+    size_crops: Sequence[int] = [224],
+    crop_scales: Sequence[Sequence[float]] = [[0.4, 1]],
+    gaussian_blur: bool = True,
+    jitter_strength: float = 1.0,
+    normalize: Optional[nn.Module] = None,
+    collate_fn: Callable = simclr_gpu_collate_fn,
+) -> Tuple[nn.Module, Callable, nn.Module]:
+    """For simclr, barlow twins and moco.
+
+    Only resizing and tensor conversion are run per sample in the data loader, the crops are extracted for the whole
+    batch on device by the returned ``KorniaMultiCropSSLTransform``.
+    """
+    transform = pth_transforms.Compose(
+        [
+            pth_transforms.Resize((max(size_crops), max(size_crops))),
+            pth_transforms.ToTensor(),
+        ]
+    )
+    gpu_transform = KorniaMultiCropSSLTransform(
+        total_num_crops=total_num_crops,
+        num_crops=num_crops,
+        size_crops=size_crops,
+        crop_scales=crop_scales,
+        collate_fn=collate_fn,
+        gaussian_blur=gaussian_blur,
+        jitter_strength=jitter_strength,
+        normalize=normalize,
+    )
+
+    return transform, kornia_collate, gpu_transform
+
+
+def swav_transform_gpu(
+    total_num_crops: int = 8,
+    num_crops: Sequence[int] = [2, 6],
+    size_crops: Sequence[int] = [224, 96],
+    crop_scales: Sequence[Sequence[float]] = [[0.4, 1], [0.05, 0.4]],
+    gaussian_blur: bool = True,
+    jitter_strength: float = 1.0,
+    normalize: Optional[nn.Module] = None,
+    collate_fn: Callable = multicrop_gpu_collate_fn,
+) -> Tuple[nn.Module, Callable, nn.Module]:
+    """For swav and dino."""
+    return simclr_transform_gpu(
+        total_num_crops=total_num_crops,
+        num_crops=num_crops,
+        size_crops=size_crops,
+        crop_scales=crop_scales,
+        gaussian_blur=gaussian_blur,
+        jitter_strength=jitter_strength,
+        normalize=normalize,
+        collate_fn=collate_fn,
+    )
+
+
+barlow_twins_transform_gpu = partial(simclr_transform_gpu, collate_fn=simclr_gpu_collate_fn)
+moco_transform_gpu = partial(simclr_transform_gpu, collate_fn=moco_gpu_collate_fn)
+dino_transform_gpu = partial(
+    swav_transform_gpu, total_num_crops=10, num_crops=[2, 8], collate_fn=multicrop_gpu_collate_fn
+)
+
+
+def _to_uint8_tensor(image) -> torch.Tensor:
+    return torch.from_numpy(np.array(image, dtype=np.uint8))
+
+
+def simclr_transform_u8(
+    total_num_crops: int = 2,
+    num_crops: Sequence[int] = [2],
+    size_crops: Sequence[int] = [224],
+    crop_scales: Sequence[Sequence[float]] = [[0.4, 1]],
+    gaussian_blur: bool = True,
+    jitter_strength: float = 1.0,
+    mean: Optional[Sequence[float]] = None,
+    std: Optional[Sequence[float]] = None,
+    collate_fn: Callable = simclr_gpu_collate_fn,
+) -> Tuple[nn.Module, Callable, nn.Module]:
+    """For simclr, barlow twins and moco.
+
+    Same as ``simclr_transform_gpu`` but the data loader yields ``uint8`` images in ``HWC`` layout, which are converted
+    to float on device. The crops are normalized with ``mean`` and ``std`` after the color augmentations.
+    """
+    normalize = None
+    if mean is not None:
+        normalize = K.augmentation.Normalize(torch.tensor(mean), torch.tensor(std))
+
+    _, collate, gpu_transform = simclr_transform_gpu(
+        total_num_crops=total_num_crops,
+        num_crops=num_crops,
+        size_crops=size_crops,
+        crop_scales=crop_scales,
+        gaussian_blur=gaussian_blur,
+        jitter_strength=jitter_strength,
+        normalize=normalize,
+        collate_fn=collate_fn,
+    )
+    transform = pth_transforms.Compose(
+        [
+            pth_transforms.Resize((max(size_crops), max(size_crops))),
+            _to_uint8_tensor,
+        ]
+    )
+    gpu_transform = nn.Sequential(ApplyToKeys(DefaultDataKeys.INPUT, UInt8ToFloat()), gpu_transform)
+
+    return transform, collate, gpu_transform
+
+
+def swav_transform_u8(
+    total_num_crops: int = 8,
+    num_crops: Sequence[int] = [2, 6],
+    size_crops: Sequence[int] = [224, 96],
+    crop_scales: Sequence[Sequence[float]] = [[0.4, 1], [0.05, 0.4]],
+    gaussian_blur: bool = True,
+    jitter_strength: float = 1.0,
+    mean: Optional[Sequence[float]] = None,
+    std: Optional[Sequence[float]] = None,
+    collate_fn: Callable = multicrop_gpu_collate_fn,
+) -> Tuple[nn.Module, Callable, nn.Module]:
+    """For swav and dino."""
+    return simclr_transform_u8(
+        total_num_crops=total_num_crops,
+        num_crops=num_crops,
+        size_crops=size_crops,
+        crop_scales=crop_scales,
+        gaussian_blur=gaussian_blur,
+        jitter_strength=jitter_strength,
+        mean=mean,
+        std=std,
+        collate_fn=collate_fn,
+    )
+
+
+barlow_twins_transform_u8 = partial(simclr_transform_u8, collate_fn=simclr_gpu_collate_fn)
+moco_transform_u8 = partial(simclr_transform_u8, collate_fn=moco_gpu_collate_fn)
+dino_transform_u8 = partial(
+    swav_transform_u8, total_num_crops=10, num_crops=[2, 8], collate_fn=multicrop_gpu_collate_fn
+)
+
+
 transforms = [
     "simclr_transform",
     "swav_transform",
     "barlow_twins_transform",
     "moco_transform",
     "dino_transform",
+    "simclr_transform_gpu",
+    "swav_transform_gpu",
+    "barlow_twins_transform_gpu",
+    "moco_transform_gpu",
+    "dino_transform_gpu",
+    "simclr_transform_u8",
+    "swav_transform_u8",
+    "barlow_twins_transform_u8",
+    "moco_transform_u8",
+    "dino_transform_u8",
 ]
 
 
@@ -94,6 +265,16 @@ def register_vissl_transforms(register: FlashRegistry):
             barlow_twins_transform,
             moco_transform,
             dino_transform,
+            simclr_transform_gpu,
+            swav_transform_gpu,
+            barlow_twins_transform_gpu,
+            moco_transform_gpu,
+            dino_transform_gpu,
+            simclr_transform_u8,
+            swav_transform_u8,
+            barlow_twins_transform_u8,
+            moco_transform_u8,
+            dino_transform_u8,
         )
     ):
         register(transform, name=transforms[idx])
@@ -11,15 +11,21 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
-from typing import Any, List, Union
+from typing import Any, Callable, List, Optional, Union
 
 import torch
 import torch.nn as nn
+from pytorch_lightning.utilities.exceptions import MisconfigurationException
+from torch.utils.data import DataLoader, Sampler
 
+import flash
 from flash.core.adapter import Adapter
+from flash.core.data.auto_dataset import BaseAutoDataset
 from flash.core.data.data_source import DefaultDataKeys
 from flash.core.model import Task
 from flash.core.utilities.imports import _VISSL_AVAILABLE
+from flash.image.embedding.spdl_loader import SPDLPipelineIterable
+from flash.image.embedding.transforms.dali_transforms import DALIDataLoader
 from flash.image.embedding.vissl.hooks import AdaptVISSLHooks
 
 if _VISSL_AVAILABLE:
@@ -52,6 +58,17 @@ class MockVISSLTask:
         self.last_batch = AttrDict({"sample": AttrDict({"input": None, "data_momentum": None})})
 
 
+class VISSLTrunkFeatures(nn.Module):
+    """Wraps a VISSL trunk to return the features of its last layer, used to export the backbone with TorchScript."""
+
+    def __init__(self, trunk: nn.Module):
+        super().__init__()
+        self.trunk = trunk
+
+    def forward(self, x: torch.Tensor) -> torch.Tensor:
+        return self.trunk(x, [])[0]
+
+
 class VISSLAdapter(Adapter, AdaptVISSLHooks):
     """The ``VISSLAdapter`` is an :class:`~flash.core.adapter.Adapter` for integrating with VISSL.
 
@@ -78,6 +95,21 @@ class VISSLAdapter(Adapter, AdaptVISSLHooks):
         self.loss_fn = loss_fn
         self.hooks = hooks
 
+        # set by the ``ImageEmbedder`` for pretraining transforms which run on device
+        self.gpu_transform = None
+        self.dali_transform = None
+        self.dali_collate_fn = None
+        self.litdata_transform = None
+        self.use_spdl = False
+
+        # additional arguments for the multiprocessing ``DataLoader`` (e.g. ``prefetch_factor``)
+        self.dataloader_kwargs = {}
+
+        # channels last enables the faster NHWC convolution kernels, vision transformers don't benefit from it
+        self.channels_last = backbone.__class__.__name__ != "VisionTransformer"
+        if self.channels_last:
+            self.backbone.to(memory_format=torch.channels_last)
+
         self.model_config.TRUNK = self.backbone.model_config.TRUNK
         self.model_config.HEAD = self.head[0].model_config.HEAD
         self.task_config = AttrDict(
@@ -156,11 +188,21 @@ class VISSLAdapter(Adapter, AdaptVISSLHooks):
 
         return cfg
 
+    def _to_memory_format(self, batch: Union[torch.Tensor, List[torch.Tensor]]) -> Any:
+        if not self.channels_last:
+            return batch
+        if isinstance(batch, list):
+            return [self._to_memory_format(crops) for crops in batch]
+        return batch.contiguous(memory_format=torch.channels_last)
+
     def forward(self, batch: torch.Tensor) -> Any:
-        return self.vissl_base_model.trunk(batch, [])[0]
+        return self.vissl_base_model.trunk(self._to_memory_format(batch), [])[0]
 
     def ssl_forward(self, batch) -> Any:
-        model_output = self.vissl_base_model(batch)
+        # the views of a batch are already stacked along the batch dimension by the simclr / moco collate functions
+        # and VISSL concatenates consecutive crops of the same resolution (``SINGLE_PASS_EVERY_CROP=False``), so the
+        # trunk runs once per crop resolution rather than once per view
+        model_output = self.vissl_base_model(self._to_memory_format(batch))
 
         # vissl-specific
         if len(model_output) == 1:
@@ -207,3 +249,105 @@ class VISSLAdapter(Adapter, AdaptVISSLHooks):
         input_image = batch[DefaultDataKeys.INPUT]
 
         return self(input_image)
+
+    def _process_dataset(
+        self,
+        dataset: BaseAutoDataset,
+        batch_size: int,
+        num_workers: int,
+        pin_memory: bool,
+        collate_fn: Callable,
+        shuffle: bool = False,
+        drop_last: bool = True,
+        sampler: Optional[Sampler] = None,
+        persistent_workers: bool = True,
+    ) -> DataLoader:
+        return DataLoader(
+            dataset,
+            batch_size=batch_size,
+            num_workers=num_workers,
+            pin_memory=pin_memory,
+            shuffle=shuffle,
+            drop_last=drop_last,
+            sampler=sampler,
+            collate_fn=collate_fn,
+            persistent_workers=persistent_workers,
+            **(self.dataloader_kwargs if num_workers > 0 else {}),
+        )
+
+    def _process_dali_dataset(
+        self,
+        dataset: BaseAutoDataset,
+        trainer: "flash.Trainer",
+        batch_size: int,
+        num_workers: int,
+        shuffle: bool,
+        drop_last: bool,
+    ) -> DALIDataLoader:
+        files = [sample[DefaultDataKeys.INPUT] for sample in dataset.data]
+        if not all(isinstance(file, str) for file in files):
+            raise MisconfigurationException(
+                "DALI pretraining transforms require the data to be loaded from files, e.g. with `from_folders`."
+            )
+        labels = [sample.get(DefaultDataKeys.TARGET, 0) for sample in dataset.data]
+
+        pipeline = self.dali_transform.dali_pipeline(
+            files,
+            labels,
+            batch_size=batch_size,
+            num_threads=max(num_workers, 1),
+            device_id=torch.cuda.current_device(),
+            shard_id=trainer.global_rank,
+            num_shards=trainer.world_size,
+            shuffle=shuffle,
+        )
+        return DALIDataLoader(pipeline, self.dali_transform.output_map, self.dali_collate_fn, drop_last=drop_last)
+
+    def process_train_dataset(
+        self,
+        dataset: BaseAutoDataset,
+        trainer: "flash.Trainer",
+        batch_size: int,
+        num_workers: int,
+        pin_memory: bool,
+        collate_fn: Callable,
+        shuffle: bool = False,
+        drop_last: bool = True,
+        sampler: Optional[Sampler] = None,
+    ) -> Any:
+        if self.dali_transform is not None:
+            return self._process_dali_dataset(dataset, trainer, batch_size, num_workers, shuffle, drop_last)
+        if self.litdata_transform is not None:
+            return self.litdata_transform.streaming_dataloader(batch_size, num_workers, shuffle, drop_last)
+        if self.use_spdl:
+            return SPDLPipelineIterable(
+                dataset,
+                collate_fn,
+                batch_size,
+                shuffle=shuffle,
+                drop_last=drop_last,
+                sampler=sampler,
+                num_replicas=trainer.world_size,
+                rank=trainer.global_rank,
+            )
+        return super().process_train_dataset(
+            dataset, trainer, batch_size, num_workers, pin_memory, collate_fn, shuffle, drop_last, sampler
+        )
+
+    def process_val_dataset(
+        self,
+        dataset: BaseAutoDataset,
+        trainer: "flash.Trainer",
+        batch_size: int,
+        num_workers: int,
+        pin_memory: bool,
+        collate_fn: Callable,
+        shuffle: bool = False,
+        drop_last: bool = False,
+        sampler: Optional[Sampler] = None,
+    ) -> Any:
+        if self.dali_transform is not None:
+            return self._process_dali_dataset(dataset, trainer, batch_size, num_workers, shuffle, drop_last)
+        return super().process_val_dataset(
+            dataset, trainer, batch_size, num_workers, pin_memory, collate_fn, shuffle, drop_last, sampler
+        )
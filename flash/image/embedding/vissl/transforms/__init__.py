@@ -1,9 +1,16 @@
 from flash.core.utilities.imports import _VISSL_AVAILABLE  # noqa: F401
-from flash.image.embedding.vissl.transforms.multicrop import StandardMultiCropSSLTransform  # noqa: F401
+from flash.image.embedding.vissl.transforms.multicrop import (  # noqa: F401
+    KorniaMultiCropSSLTransform,
+    StandardMultiCropSSLTransform,
+    UInt8ToFloat,
+)
 from flash.image.embedding.vissl.transforms.utilities import (  # noqa: F401
     moco_collate_fn,
+    moco_gpu_collate_fn,
     multicrop_collate_fn,
+    multicrop_gpu_collate_fn,
     simclr_collate_fn,
+    simclr_gpu_collate_fn,
 )
 
 if _VISSL_AVAILABLE:
@@ -11,16 +11,22 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
-from typing import List, Optional, Sequence
+from typing import Any, Callable, Dict, List, Optional, Sequence
 
 import numpy as np
+import torch
 import torch.nn as nn
+import torch.nn.functional as F
 
-from flash.core.utilities.imports import _TORCHVISION_AVAILABLE, Image
+from flash.core.data.data_source import DefaultDataKeys
+from flash.core.utilities.imports import _KORNIA_AVAILABLE, _TORCHVISION_AVAILABLE, Image
 
 if _TORCHVISION_AVAILABLE:
     import torchvision.transforms as pth_transforms
 
+if _KORNIA_AVAILABLE:
+    import kornia as K
+
 
 class StandardMultiCropSSLTransform(nn.Module):
     """Convert a PIL image to Multi-resolution Crops. The input is a PIL image and output is the list of image
@@ -121,3 +127,125 @@ class StandardMultiCropSSLTransform(nn.Module):
     def __call__(self, image: Image.Image) -> List[Image.Image]:
         images = [transform(image) for transform in self.transforms]
         return images
+
+
+class UInt8ToFloat(nn.Module):
+    """Convert a batch of ``uint8`` images in ``NHWC`` layout to ``float`` images scaled to [0, 1] in ``NCHW`` layout
+    (with channels last strides). Transferring the ``uint8`` images to the device is four times cheaper than float
+    images, the crops are normalized once extracted."""
+
+    def forward(self, x: torch.Tensor) -> torch.Tensor:
+        return x.permute(0, 3, 1, 2).float().div_(255)
+
+
+class _RandomGaussianBlur(nn.Module):
+    """Blur a random subset of the samples in a batch, each selected with probability ``p``, with a Gaussian kernel
+    whose standard deviation is drawn uniformly from ``sigma`` for every sample like
+    ``torchvision.transforms.GaussianBlur`` does per image."""
+
+    def __init__(self, kernel_size: int, sigma: Sequence[float] = (0.1, 2.0), p: float = 0.5):
+        super().__init__()
+        self.kernel_size = kernel_size
+        self.sigma = sigma
+        self.p = p
+
+    def forward(self, x: torch.Tensor) -> torch.Tensor:
+        mask = torch.rand(x.shape[0], device=x.device) < self.p
+        if not mask.any():
+            return x
+
+        selected = x[mask]
+        num_samples, num_channels, height, width = selected.shape
+
+        sigma = torch.empty(num_samples, 1, device=x.device, dtype=x.dtype).uniform_(*self.sigma)
+        coordinates = torch.arange(self.kernel_size, device=x.device, dtype=x.dtype) - self.kernel_size // 2
+        kernel = torch.exp(-(coordinates ** 2) / (2 * sigma ** 2))
+        kernel = (kernel / kernel.sum(dim=1, keepdim=True)).repeat_interleave(num_channels, dim=0)
+
+        # separable depthwise convolution with one kernel per sample and channel
+        padding = self.kernel_size // 2
+        selected = selected.reshape(1, num_samples * num_channels, height, width)
+        selected = F.pad(selected, (padding, padding, padding, padding), mode="reflect")
+        selected = F.conv2d(selected, kernel.view(-1, 1, 1, self.kernel_size), groups=num_samples * num_channels)
+        selected = F.conv2d(selected, kernel.view(-1, 1, self.kernel_size, 1), groups=num_samples * num_channels)
+
+        x = x.clone()
+        x[mask] = selected.view(num_samples, num_channels, height, width)
+        return x
+
+
+class KorniaMultiCropSSLTransform(nn.Module):
+    """GPU counterpart of :class:`StandardMultiCropSSLTransform` built from Kornia augmentations. The input is a
+    collated batch whose ``DefaultDataKeys.INPUT`` is a ``[B, C, H, W]`` tensor already on device, each crop is
+    extracted for the whole batch at once and ``collate_fn`` arranges the crops into the layout expected by the
+    VISSL training strategy.
+
+    Args:
+        total_num_crops (int): Total number of crops to extract
+        num_crops (List or Tuple of ints): Specifies the number of `type' of crops.
+        size_crops (List or Tuple of ints): Specifies the height (height = width)
+                                            of each patch
+        crop_scales (List or Tuple containing [float, float]): Scale of the crop
+        collate_fn (Callable): Function taking the batch and list of crops and returning the batch with the crops
+                               stored in the VISSL layout, see ``flash.image.embedding.vissl.transforms.utilities``
+        gaussian_blur (bool): Specifies if the transforms composition has Gaussian Blur
+        jitter_strength (float): Specify the coefficient for color jitter transform
+        normalize (Optional): Normalize transform from kornia with params set
+                              according to the dataset
+    """
+
+    def __init__(
+        self,
+        total_num_crops: int,
+        num_crops: Sequence[int],
+        size_crops: Sequence[int],
+        crop_scales: Sequence[Sequence[float]],
+        collate_fn: Callable,
+        gaussian_blur: bool = True,
+        jitter_strength: float = 1.0,
+        normalize: Optional[nn.Module] = None,
+    ):
+        super().__init__()
+
+        assert np.sum(num_crops) == total_num_crops
+        assert len(size_crops) == len(num_crops)
+        assert len(size_crops) == len(crop_scales)
+
+        self.collate_fn = collate_fn
+
+        color_transform = [
+            K.augmentation.ColorJitter(
+                0.8 * jitter_strength,
+                0.8 * jitter_strength,
+                0.8 * jitter_strength,
+                0.2 * jitter_strength,
+                p=0.8,
+            ),
+            K.augmentation.RandomGrayscale(p=0.2),
+        ]
+
+        if gaussian_blur:
+            kernel_size = int(0.1 * size_crops[0])
+            if kernel_size % 2 == 0:
+                kernel_size += 1
+
+            color_transform.append(_RandomGaussianBlur(kernel_size, p=0.5))
+
+        if normalize is not None:
+            color_transform.append(normalize)
+
+        transforms = []
+        for num, size, scale in zip(num_crops, size_crops, crop_scales):
+            transform = nn.Sequential(
+                K.augmentation.RandomResizedCrop((size, size), scale=tuple(scale)),
+                K.augmentation.RandomHorizontalFlip(p=0.5),
+                *color_transform,
+            )
+            transforms.extend([transform] * num)
+
+        self.transforms = nn.ModuleList(transforms)
+
+    def forward(self, batch: Dict[str, Any]) -> Dict[str, Any]:
+        images = batch[DefaultDataKeys.INPUT]
+        crops = [transform(images) for transform in self.transforms]
+        return self.collate_fn(batch, crops)
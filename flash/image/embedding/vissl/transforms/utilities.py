@@ -88,3 +88,25 @@ def moco_collate_fn(samples):
     result["data_momentum"] = torch.stack(inputs).squeeze()[:, 1, :, :, :].squeeze()
 
     return result
+
+
+def simclr_gpu_collate_fn(batch, crops):
+    """GPU counterpart of :func:`simclr_collate_fn`, stacks the crops of a batch into a single view-major tensor."""
+    batch[DefaultDataKeys.INPUT] = torch.cat(crops)
+
+    return batch
+
+
+def multicrop_gpu_collate_fn(batch, crops):
+    """GPU counterpart of :func:`multicrop_collate_fn`, keeps one batched tensor per crop."""
+    batch[DefaultDataKeys.INPUT] = crops
+
+    return batch
+
+
+def moco_gpu_collate_fn(batch, crops):
+    """GPU counterpart of :func:`moco_collate_fn`, the second crop is used as the momentum encoder input."""
+    batch[DefaultDataKeys.INPUT] = crops[0]
+    batch["data_momentum"] = crops[1]
+
+    return batch
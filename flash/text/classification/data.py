@@ -30,16 +30,26 @@ from flash.core.utilities.imports import _TEXT_AVAILABLE, requires
 
 if _TEXT_AVAILABLE:
     from datasets import Dataset, DatasetDict, load_dataset
-    from transformers import AutoTokenizer, default_data_collator
+    from transformers import AutoTokenizer, default_data_collator, PreTrainedTokenizerBase
     from transformers.modeling_outputs import SequenceClassifierOutput
 
 
 class TextDeserializer(Deserializer):
     @requires("text")
-    def __init__(self, backbone: str, max_length: int, use_fast: bool = True, **kwargs):
+    def __init__(
+        self,
+        backbone: str,
+        max_length: int,
+        use_fast: bool = True,
+        tokenizer: Optional["PreTrainedTokenizerBase"] = None,
+        **kwargs,
+    ):
         super().__init__()
         self.backbone = backbone
-        self.tokenizer = AutoTokenizer.from_pretrained(backbone, use_fast=use_fast, **kwargs)
+        self.tokenizer_passed = tokenizer is not None
+        if tokenizer is None:
+            tokenizer = AutoTokenizer.from_pretrained(backbone, use_fast=use_fast, **kwargs)
+        self.tokenizer = tokenizer
         self.max_length = max_length
 
     def deserialize(self, text: str) -> Tensor:
@@ -51,12 +61,15 @@ class TextDeserializer(Deserializer):
 
     def __getstate__(self):  # TODO: Find out why this is being pickled
         state = self.__dict__.copy()
-        state.pop("tokenizer")
+        # a tokenizer passed by the user is pickled as it may not match ``backbone``
+        if not self.tokenizer_passed:
+            state.pop("tokenizer")
         return state
 
     def __setstate__(self, state):
         self.__dict__.update(state)
-        self.tokenizer = AutoTokenizer.from_pretrained(self.backbone, use_fast=True)
+        if "tokenizer" not in state:
+            self.tokenizer = AutoTokenizer.from_pretrained(self.backbone, use_fast=True)
 
 
 class TextDataSource(DataSource):
@@ -29,7 +29,7 @@ from flash.text.classification.data import TextDeserializer
 if _TEXT_AVAILABLE:
     import datasets
     from datasets import DatasetDict, load_dataset
-    from transformers import AutoTokenizer, default_data_collator
+    from transformers import AutoTokenizer, default_data_collator, PreTrainedTokenizerBase
 
 
 class Seq2SeqDataSource(DataSource):
@@ -40,13 +40,17 @@ class Seq2SeqDataSource(DataSource):
         max_source_length: int = 128,
         max_target_length: int = 128,
         padding: Union[str, bool] = "max_length",
+        tokenizer: Optional["PreTrainedTokenizerBase"] = None,
         **backbone_kwargs,
     ):
         super().__init__()
 
         self.backbone = backbone
         self.backbone_kwargs = backbone_kwargs
-        self.tokenizer = AutoTokenizer.from_pretrained(self.backbone, use_fast=True, **backbone_kwargs)
+        self.tokenizer_passed = tokenizer is not None
+        if tokenizer is None:
+            tokenizer = AutoTokenizer.from_pretrained(self.backbone, use_fast=True, **backbone_kwargs)
+        self.tokenizer = tokenizer
         self.max_source_length = max_source_length
         self.max_target_length = max_target_length
         self.padding = padding
@@ -85,12 +89,15 @@ class Seq2SeqDataSource(DataSource):
 
     def __getstate__(self):  # TODO: Find out why this is being pickled
         state = self.__dict__.copy()
-        state.pop("tokenizer")
+        # a tokenizer passed by the user is pickled as it may not match ``backbone``
+        if not self.tokenizer_passed:
+            state.pop("tokenizer")
         return state
 
     def __setstate__(self, state):
         self.__dict__.update(state)
-        self.tokenizer = AutoTokenizer.from_pretrained(self.backbone, use_fast=True, **self.backbone_kwargs)
+        if "tokenizer" not in state:
+            self.tokenizer = AutoTokenizer.from_pretrained(self.backbone, use_fast=True, **self.backbone_kwargs)
 
 
 class Seq2SeqFileDataSource(Seq2SeqDataSource):
@@ -101,9 +108,12 @@ class Seq2SeqFileDataSource(Seq2SeqDataSource):
         max_source_length: int = 128,
         max_target_length: int = 128,
         padding: Union[str, bool] = "max_length",
+        tokenizer: Optional["PreTrainedTokenizerBase"] = None,
         **backbone_kwargs,
     ):
-        super().__init__(backbone, max_source_length, max_target_length, padding, **backbone_kwargs)
+        super().__init__(
+            backbone, max_source_length, max_target_length, padding, tokenizer=tokenizer, **backbone_kwargs
+        )
 
         self.filetype = filetype
 
@@ -153,12 +163,15 @@ class Seq2SeqFileDataSource(Seq2SeqDataSource):
 
     def __getstate__(self):  # TODO: Find out why this is being pickled
         state = self.__dict__.copy()
-        state.pop("tokenizer")
+        # a tokenizer passed by the user is pickled as it may not match ``backbone``
+        if not self.tokenizer_passed:
+            state.pop("tokenizer")
         return state
 
     def __setstate__(self, state):
         self.__dict__.update(state)
-        self.tokenizer = AutoTokenizer.from_pretrained(self.backbone, use_fast=True, **self.backbone_kwargs)
+        if "tokenizer" not in state:
+            self.tokenizer = AutoTokenizer.from_pretrained(self.backbone, use_fast=True, **self.backbone_kwargs)
 
 
 class Seq2SeqCSVDataSource(Seq2SeqFileDataSource):
@@ -168,6 +181,7 @@ class Seq2SeqCSVDataSource(Seq2SeqFileDataSource):
         max_source_length: int = 128,
         max_target_length: int = 128,
         padding: Union[str, bool] = "max_length",
+        tokenizer: Optional["PreTrainedTokenizerBase"] = None,
         **backbone_kwargs,
     ):
         super().__init__(
@@ -176,17 +190,21 @@ class Seq2SeqCSVDataSource(Seq2SeqFileDataSource):
             max_source_length=max_source_length,
             max_target_length=max_target_length,
             padding=padding,
+            tokenizer=tokenizer,
             **backbone_kwargs,
         )
 
     def __getstate__(self):  # TODO: Find out why this is being pickled
         state = self.__dict__.copy()
-        state.pop("tokenizer")
+        # a tokenizer passed by the user is pickled as it may not match ``backbone``
+        if not self.tokenizer_passed:
+            state.pop("tokenizer")
         return state
 
     def __setstate__(self, state):
         self.__dict__.update(state)
-        self.tokenizer = AutoTokenizer.from_pretrained(self.backbone, use_fast=True, **self.backbone_kwargs)
+        if "tokenizer" not in state:
+            self.tokenizer = AutoTokenizer.from_pretrained(self.backbone, use_fast=True, **self.backbone_kwargs)
 
 
 class Seq2SeqJSONDataSource(Seq2SeqFileDataSource):
@@ -196,6 +214,7 @@ class Seq2SeqJSONDataSource(Seq2SeqFileDataSource):
         max_source_length: int = 128,
         max_target_length: int = 128,
         padding: Union[str, bool] = "max_length",
+        tokenizer: Optional["PreTrainedTokenizerBase"] = None,
         **backbone_kwargs,
     ):
         super().__init__(
@@ -204,17 +223,21 @@ class Seq2SeqJSONDataSource(Seq2SeqFileDataSource):
             max_source_length=max_source_length,
             max_target_length=max_target_length,
             padding=padding,
+            tokenizer=tokenizer,
             **backbone_kwargs,
         )
 
     def __getstate__(self):  # TODO: Find out why this is being pickled
         state = self.__dict__.copy()
-        state.pop("tokenizer")
+        # a tokenizer passed by the user is pickled as it may not match ``backbone``
+        if not self.tokenizer_passed:
+            state.pop("tokenizer")
         return state
 
     def __setstate__(self, state):
         self.__dict__.update(state)
-        self.tokenizer = AutoTokenizer.from_pretrained(self.backbone, use_fast=True, **self.backbone_kwargs)
+        if "tokenizer" not in state:
+            self.tokenizer = AutoTokenizer.from_pretrained(self.backbone, use_fast=True, **self.backbone_kwargs)
 
 
 class Seq2SeqSentencesDataSource(Seq2SeqDataSource):
@@ -226,16 +249,21 @@ class Seq2SeqSentencesDataSource(Seq2SeqDataSource):
 
         if isinstance(data, str):
             data = [data]
-        return [self._tokenize_fn(s) for s in data]
+        # tokenize all the sentences with a single (batched) tokenizer call and split the outputs per sentence
+        model_inputs = self._tokenize_fn(data)
+        return [dict(zip(model_inputs.keys(), sample)) for sample in zip(*model_inputs.values())]
 
     def __getstate__(self):  # TODO: Find out why this is being pickled
         state = self.__dict__.copy()
-        state.pop("tokenizer")
+        # a tokenizer passed by the user is pickled as it may not match ``backbone``
+        if not self.tokenizer_passed:
+            state.pop("tokenizer")
         return state
 
     def __setstate__(self, state):
         self.__dict__.update(state)
-        self.tokenizer = AutoTokenizer.from_pretrained(self.backbone, use_fast=True, **self.backbone_kwargs)
+        if "tokenizer" not in state:
+            self.tokenizer = AutoTokenizer.from_pretrained(self.backbone, use_fast=True, **self.backbone_kwargs)
 
 
 @dataclass(unsafe_hash=True, frozen=True)
@@ -260,6 +288,7 @@ class Seq2SeqPreprocess(Preprocess):
         max_source_length: int = 128,
         max_target_length: int = 128,
         padding: Union[str, bool] = "max_length",
+        tokenizer: Optional["PreTrainedTokenizerBase"] = None,
         **backbone_kwargs,
     ):
         self.backbone = backbone
@@ -278,6 +307,7 @@ class Seq2SeqPreprocess(Preprocess):
                     max_source_length=max_source_length,
                     max_target_length=max_target_length,
                     padding=padding,
+                    tokenizer=tokenizer,
                     **backbone_kwargs,
                 ),
                 DefaultDataSources.JSON: Seq2SeqJSONDataSource(
@@ -285,6 +315,7 @@ class Seq2SeqPreprocess(Preprocess):
                     max_source_length=max_source_length,
                     max_target_length=max_target_length,
                     padding=padding,
+                    tokenizer=tokenizer,
                     **backbone_kwargs,
                 ),
                 "sentences": Seq2SeqSentencesDataSource(
@@ -292,11 +323,12 @@ class Seq2SeqPreprocess(Preprocess):
                     max_source_length=max_source_length,
                     max_target_length=max_target_length,
                     padding=padding,
+                    tokenizer=tokenizer,
                     **backbone_kwargs,
                 ),
             },
             default_data_source="sentences",
-            deserializer=TextDeserializer(backbone, max_source_length),
+            deserializer=TextDeserializer(backbone, max_source_length, tokenizer=tokenizer),
         )
 
         self.set_state(Seq2SeqBackboneState(self.backbone, backbone_kwargs))
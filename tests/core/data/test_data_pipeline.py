@@ -323,6 +323,31 @@ def test_detach_preprocessing_from_model(tmpdir):
     assert model.train_dataloader().collate_fn == default_collate
 
 
+def test_attach_preprocessing_to_model_iterable(tmpdir):
+    class Batches:
+        def __iter__(self):
+            yield torch.rand(2, 1)
+
+    batches = Batches()
+
+    class CustomModel(Task):
+        def __init__(self):
+            super().__init__(model=torch.nn.Linear(1, 1), loss_fn=torch.nn.MSELoss())
+
+        def train_dataloader(self) -> Any:
+            return batches
+
+    model = CustomModel()
+    model.data_pipeline = DataPipeline(preprocess=CustomPreprocess())
+
+    # attaching twice used to fail as the iterable was assigned to the model without being patched
+    model.on_train_dataloader()
+    model.on_train_dataloader()
+    assert model.train_dataloader() is batches
+    assert isinstance(model.transfer_batch_to_device, _StageOrchestrator)
+    assert model.transfer_batch_to_device._stage_mapping[RunningStage.TRAINING] is not None
+
+
 class TestPreprocess(DefaultPreprocess):
     def train_per_sample_transform(self, *_, **__):
         pass
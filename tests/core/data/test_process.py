@@ -16,6 +16,7 @@ from unittest.mock import Mock
 
 import pytest
 import torch
+from pytorch_lightning.trainer.states import RunningStage
 from pytorch_lightning.utilities.exceptions import MisconfigurationException
 from torch.utils.data import DataLoader
 
@@ -26,6 +27,7 @@ from flash.core.data.data_pipeline import DataPipeline, DataPipelineState, Defau
 from flash.core.data.data_source import DefaultDataSources
 from flash.core.data.process import Serializer, SerializerMapping
 from flash.core.data.properties import ProcessState
+from flash.core.data.states import PerBatchTransformOnDevice, PreTensorTransform
 
 
 def test_serializer():
@@ -150,3 +152,47 @@ def test_check_transforms():
     transform = torch.nn.Identity()
     DefaultPreprocess(train_transform=transform)
     DefaultPreprocess(train_transform=[transform])
+
+
+def test_process_state_transforms():
+    """Tests that transforms provided through a process state override the preprocess transforms and that a state
+    without transform skips the hook."""
+    preprocess = DefaultPreprocess(train_transform={"pre_tensor_transform": lambda x: x + 1})
+    preprocess.training = True
+    preprocess.current_fn = "pre_tensor_transform"
+
+    assert preprocess.pre_tensor_transform(1) == 2
+
+    preprocess.set_state(PreTensorTransform(lambda x: x * 10))
+    assert preprocess.pre_tensor_transform(1) == 10
+
+    preprocess.set_state(PreTensorTransform(None))
+    assert preprocess.pre_tensor_transform(1) == 1
+
+    # lists of samples are transformed element-wise
+    preprocess.set_state(PreTensorTransform(lambda x: x * 10))
+    assert preprocess.pre_tensor_transform([1, 2]) == [10, 20]
+
+    # states of an attached data pipeline state are resolved on attach
+    preprocess = DefaultPreprocess()
+    data_pipeline_state = DataPipelineState()
+    data_pipeline_state.set_state(PreTensorTransform(lambda x: x - 1))
+    preprocess.attach_data_pipeline_state(data_pipeline_state)
+    assert preprocess.pre_tensor_transform(1) == 0
+
+    # the on device batch transform is replaced as a whole
+    preprocess = DefaultPreprocess(train_transform={"per_batch_transform_on_device": lambda x: x + 1})
+    preprocess.training = True
+    preprocess.current_fn = "per_batch_transform_on_device"
+    assert preprocess.per_batch_transform_on_device(1) == 2
+    preprocess.set_state(PerBatchTransformOnDevice(lambda x: x * 2))
+    assert preprocess.per_batch_transform_on_device([1]) == [1, 1]
+    preprocess.set_state(PerBatchTransformOnDevice(None))
+    assert preprocess.per_batch_transform_on_device(1) == 1
+
+    # the transform of the preprocess is used for the other stages
+    preprocess.set_state(PerBatchTransformOnDevice(lambda x: x * 10, stages=(RunningStage.TRAINING,)))
+    assert preprocess.per_batch_transform_on_device(1) == 10
+    preprocess.training = False
+    preprocess.predicting = True
+    assert preprocess.per_batch_transform_on_device(1) == 1
@@ -12,9 +12,17 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 import pytest
+import torch
 
 from flash.core.data.data_source import DefaultDataKeys
-from flash.core.utilities.imports import _TORCHVISION_AVAILABLE, _VISSL_AVAILABLE
+from flash.core.utilities.imports import _KORNIA_AVAILABLE, _TORCHVISION_AVAILABLE, _VISSL_AVAILABLE
+from flash.image.embedding.vissl.transforms import (
+    KorniaMultiCropSSLTransform,
+    multicrop_gpu_collate_fn,
+    simclr_gpu_collate_fn,
+    UInt8ToFloat,
+)
+from flash.image.embedding.vissl.transforms.multicrop import _RandomGaussianBlur
 from tests.image.embedding.utils import ssl_datamodule
 
 
@@ -39,3 +47,72 @@ def test_multicrop_input_transform():
     assert batch[DefaultDataKeys.INPUT][0].shape == (batch_size, 3, size_crops[0], size_crops[0])
     assert batch[DefaultDataKeys.INPUT][-1].shape == (batch_size, 3, size_crops[-1], size_crops[-1])
     assert list(batch[DefaultDataKeys.TARGET].shape) == [batch_size]
+
+
+@pytest.mark.skipif(not _KORNIA_AVAILABLE, reason="kornia not installed.")
+@pytest.mark.parametrize(
+    "collate_fn, num_crops, size_crops, crop_scales",
+    [
+        (simclr_gpu_collate_fn, [2], [96], [[0.4, 1]]),
+        (multicrop_gpu_collate_fn, [2, 4], [96, 64], [[0.4, 1], [0.05, 0.4]]),
+    ],
+)
+def test_kornia_multicrop_transform(collate_fn, num_crops, size_crops, crop_scales):
+    batch_size = 4
+    transform = KorniaMultiCropSSLTransform(
+        total_num_crops=sum(num_crops),
+        num_crops=num_crops,
+        size_crops=size_crops,
+        crop_scales=crop_scales,
+        collate_fn=collate_fn,
+    )
+
+    batch = transform({DefaultDataKeys.INPUT: torch.rand(batch_size, 3, 128, 128)})
+
+    if collate_fn is simclr_gpu_collate_fn:
+        assert batch[DefaultDataKeys.INPUT].shape == (num_crops[0] * batch_size, 3, size_crops[0], size_crops[0])
+    else:
+        assert len(batch[DefaultDataKeys.INPUT]) == sum(num_crops)
+        assert batch[DefaultDataKeys.INPUT][0].shape == (batch_size, 3, size_crops[0], size_crops[0])
+        assert batch[DefaultDataKeys.INPUT][-1].shape == (batch_size, 3, size_crops[-1], size_crops[-1])
+
+
+def test_uint8_to_float():
+    images = torch.randint(0, 256, (2, 32, 32, 3), dtype=torch.uint8)
+
+    out = UInt8ToFloat()(images)
+
+    assert out.shape == (2, 3, 32, 32)
+    assert torch.allclose(out, images.permute(0, 3, 1, 2).float() / 255)
+
+
+def test_random_gaussian_blur():
+    images = torch.rand(4, 3, 32, 32)
+
+    assert torch.equal(_RandomGaussianBlur(5, p=0.0)(images), images)
+
+    torch.manual_seed(42)
+    blurred = _RandomGaussianBlur(5, sigma=(0.1, 2.0), p=1.0)(images)
+    assert blurred.shape == images.shape
+    assert not torch.allclose(blurred, images)
+    # the kernels are normalized so the mean intensity is (almost) preserved
+    assert torch.allclose(blurred.mean(), images.mean(), atol=1e-2)
+
+    # a tiny standard deviation doesn't blur the images
+    assert torch.allclose(_RandomGaussianBlur(5, sigma=(1e-3, 1e-3), p=1.0)(images), images)
+
+
+@pytest.mark.skipif(not (_TORCHVISION_AVAILABLE and _KORNIA_AVAILABLE), reason="kornia not installed.")
+def test_transform_u8():
+    from flash.image.embedding.transforms.vissl_transforms import simclr_transform_u8
+
+    _, collate, gpu_transform = simclr_transform_u8(size_crops=[32], mean=[0.5, 0.5, 0.5], std=[0.5, 0.5, 0.5])
+    images = torch.randint(0, 256, (2, 32, 32, 3), dtype=torch.uint8)
+
+    batch = gpu_transform({DefaultDataKeys.INPUT: images})
+
+    # the crops are normalized after the color augmentations which clamp to [0, 1]
+    assert batch[DefaultDataKeys.INPUT].dtype == torch.float32
+    assert batch[DefaultDataKeys.INPUT].shape == (4, 3, 32, 32)
+    assert batch[DefaultDataKeys.INPUT].min() >= -1
+    assert batch[DefaultDataKeys.INPUT].max() <= 1
@@ -85,6 +85,27 @@ def test_registry():
     assert backbones.available_keys() == ["foo", "foo", "foo", "foo", "foo", "my_model"]
 
 
+def test_registry_version():
+    backbones = FlashRegistry("backbones")
+    assert backbones.version == 0
+
+    def my_model():
+        return nn.Linear(1, 1)
+
+    backbones(my_model)
+    assert backbones.version == 1
+
+    backbones(my_model, override=True)
+    assert backbones.version == 2
+
+    backbones.remove("my_model")
+    assert backbones.version == 3
+
+    other = FlashRegistry("other")
+    other(my_model)
+    assert (backbones + other).version == 4
+
+
 # todo (tchaton) Debug this test.
 @pytest.mark.skipif(True, reason="need investigation")
 def test_registry_multiple_decorators(caplog):
@@ -11,14 +11,30 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import gc
+import os
 import re
+from unittest import mock
 
 import pytest
 import torch
+from pytorch_lightning.utilities.exceptions import MisconfigurationException
 
 import flash
-from flash.core.utilities.imports import _IMAGE_AVAILABLE, _TORCHVISION_AVAILABLE, _VISSL_AVAILABLE
+from flash.core.data.data_source import DefaultDataKeys
+from flash.core.registry import FlashRegistry
+from flash.core.utilities.imports import (
+    _DALI_AVAILABLE,
+    _IMAGE_AVAILABLE,
+    _LITDATA_AVAILABLE,
+    _SPDL_AVAILABLE,
+    _TORCH_GREATER_EQUAL_1_10,
+    _TORCHVISION_AVAILABLE,
+    _VISSL_AVAILABLE,
+)
 from flash.image import ImageClassificationData, ImageEmbedder
+from flash.image.embedding.spdl_loader import SPDLPipelineIterable
+from tests.image.embedding.utils import image_folder
 
 if _TORCHVISION_AVAILABLE:
     from torchvision.datasets import FakeData
@@ -52,7 +68,12 @@ def test_load_from_checkpoint_dependency_error():
 
 @pytest.mark.skipif(not (_TORCHVISION_AVAILABLE and _VISSL_AVAILABLE), reason="vissl not installed.")
 @pytest.mark.parametrize("backbone, training_strategy", [("resnet", "barlow_twins")])
-def test_vissl_training(tmpdir, backbone, training_strategy):
+@pytest.mark.parametrize(
+    "pretraining_transform", ["barlow_twins_transform", "barlow_twins_transform_gpu", "barlow_twins_transform_u8"]
+)
+def test_vissl_training(tmpdir, backbone, training_strategy, pretraining_transform):
+    # the default transforms of the data module normalize the images on device, the ``_gpu`` and ``_u8`` transforms
+    # must replace them to receive the images as loaded
     datamodule = ImageClassificationData.from_datasets(
         train_dataset=FakeData(),
         batch_size=4,
@@ -62,7 +83,7 @@ def test_vissl_training(tmpdir, backbone, training_strategy):
         backbone=backbone,
         training_strategy=training_strategy,
         head="simclr_head",
-        pretraining_transform="barlow_twins_transform",
+        pretraining_transform=pretraining_transform,
         training_strategy_kwargs={"latent_embedding_dim": 128},
         pretraining_transform_kwargs={
             "total_num_crops": 2,
@@ -74,3 +95,290 @@ def test_vissl_training(tmpdir, backbone, training_strategy):
 
     trainer = flash.Trainer(max_steps=3, max_epochs=1, gpus=torch.cuda.device_count())
     trainer.fit(embedder, datamodule=datamodule)
+
+    # the ``*_kwargs`` are saved with the hyper-parameters, e.g. the size of the head matches the checkpoint
+    path = os.path.join(tmpdir, "embedder.pt")
+    trainer.save_checkpoint(path)
+    loaded = ImageEmbedder.load_from_checkpoint(path)
+    assert loaded.hparams.training_strategy_kwargs == {"latent_embedding_dim": 128}
+
+
+@pytest.mark.skipif(not (_TORCHVISION_AVAILABLE and _VISSL_AVAILABLE), reason="vissl not installed.")
+@pytest.mark.parametrize("pretraining_transform", ["barlow_twins_transform_gpu"])
+def test_vissl_predict(tmpdir, pretraining_transform):
+    datamodule = ImageClassificationData.from_datasets(
+        predict_dataset=FakeData(size=4),
+        batch_size=2,
+    )
+
+    embedder = ImageEmbedder(
+        backbone="resnet",
+        training_strategy="barlow_twins",
+        head="simclr_head",
+        pretraining_transform=pretraining_transform,
+        training_strategy_kwargs={"latent_embedding_dim": 128},
+        pretraining_transform_kwargs={
+            "total_num_crops": 2,
+            "num_crops": [2],
+            "size_crops": [96],
+            "crop_scales": [[0.4, 1]],
+        },
+    )
+
+    # the crops are only extracted while pretraining, one embedding is predicted per image
+    trainer = flash.Trainer(gpus=torch.cuda.device_count())
+    predictions = trainer.predict(embedder, datamodule=datamodule)
+    assert [len(batch) for batch in predictions] == [2, 2]
+
+
+@pytest.mark.skipif(not (_TORCHVISION_AVAILABLE and _VISSL_AVAILABLE), reason="vissl not installed.")
+@pytest.mark.skipif(not _SPDL_AVAILABLE, reason="spdl not installed.")
+def test_vissl_training_spdl(tmpdir, monkeypatch):
+    monkeypatch.setenv("FLASH_USE_SPDL", "1")
+
+    datamodule = ImageClassificationData.from_datasets(
+        train_dataset=FakeData(),
+        batch_size=4,
+    )
+
+    embedder = ImageEmbedder(
+        backbone="resnet",
+        training_strategy="barlow_twins",
+        head="simclr_head",
+        pretraining_transform="barlow_twins_transform_gpu",
+        training_strategy_kwargs={"latent_embedding_dim": 128},
+        pretraining_transform_kwargs={
+            "total_num_crops": 2,
+            "num_crops": [2],
+            "size_crops": [96],
+            "crop_scales": [[0.4, 1]],
+        },
+    )
+
+    trainer = flash.Trainer(max_steps=3, max_epochs=1, gpus=torch.cuda.device_count())
+    # the crops are only extracted if the device transform is attached to the SPDL batches
+    trainer.fit(embedder, datamodule=datamodule)
+
+
+@pytest.mark.skipif(not (_TORCHVISION_AVAILABLE and _VISSL_AVAILABLE), reason="vissl not installed.")
+@pytest.mark.skipif(not (_DALI_AVAILABLE and torch.cuda.is_available()), reason="dali requires a GPU.")
+def test_vissl_training_dali(tmpdir):
+    datamodule = ImageClassificationData.from_folders(
+        train_folder=image_folder(tmpdir / "train"),
+        val_folder=image_folder(tmpdir / "val"),
+        batch_size=2,
+    )
+
+    embedder = ImageEmbedder(
+        backbone="resnet",
+        training_strategy="barlow_twins",
+        head="simclr_head",
+        pretraining_transform="barlow_twins_transform_dali",
+        training_strategy_kwargs={"latent_embedding_dim": 128},
+        pretraining_transform_kwargs={
+            "total_num_crops": 2,
+            "num_crops": [2],
+            "size_crops": [96],
+            "crop_scales": [[0.4, 1]],
+        },
+    )
+
+    # the DALI loaders replace the ``DataLoader`` of both the training and the validation stages
+    trainer = flash.Trainer(max_steps=3, max_epochs=1, limit_val_batches=2, gpus=1)
+    trainer.fit(embedder, datamodule=datamodule)
+
+
+@pytest.mark.skipif(not (_TORCHVISION_AVAILABLE and _VISSL_AVAILABLE), reason="vissl not installed.")
+@pytest.mark.skipif(not _LITDATA_AVAILABLE, reason="litdata not installed.")
+def test_vissl_training_litdata(tmpdir):
+    root = image_folder(tmpdir / "images")
+    ImageEmbedder.cache_to_litdata(root, str(tmpdir / "cache"), image_size=96)
+
+    # the training images are streamed from the cache, the validation images are loaded by the data module
+    datamodule = ImageClassificationData.from_folders(
+        train_folder=root,
+        val_folder=root,
+        batch_size=2,
+    )
+
+    embedder = ImageEmbedder(
+        backbone="resnet",
+        training_strategy="barlow_twins",
+        head="simclr_head",
+        pretraining_transform="barlow_twins_transform_litdata",
+        training_strategy_kwargs={"latent_embedding_dim": 128},
+        pretraining_transform_kwargs={
+            "input_dir": str(tmpdir / "cache"),
+            "total_num_crops": 2,
+            "num_crops": [2],
+            "size_crops": [96],
+            "crop_scales": [[0.4, 1]],
+        },
+    )
+
+    trainer = flash.Trainer(max_steps=3, max_epochs=1, limit_val_batches=2, gpus=torch.cuda.device_count())
+    trainer.fit(embedder, datamodule=datamodule)
+
+
+@pytest.mark.skipif(not _SPDL_AVAILABLE, reason="spdl not installed.")
+def test_spdl_pipeline_iterable_shards():
+    dataset = list(range(10))
+    shards = [
+        SPDLPipelineIterable(dataset, list, batch_size=5, shuffle=True, num_replicas=2, rank=rank) for rank in range(2)
+    ]
+
+    assert [len(shard) for shard in shards] == [1, 1]
+    batches = [batch for shard in shards for batch in shard]
+    assert sorted(batches[0] + batches[1]) == dataset
+
+
+@pytest.mark.skipif(not _SPDL_AVAILABLE, reason="spdl not installed.")
+def test_spdl_pipeline_iterable_collate_copy():
+    class Collate:
+        running_stage = None
+
+        def __call__(self, samples):
+            assert self.running_stage is None
+            return samples
+
+    # the running stage set by the training loop on the collate function is not seen by the pipeline threads
+    collate_fn = Collate()
+    loader = SPDLPipelineIterable(list(range(10)), collate_fn, batch_size=5)
+    collate_fn.running_stage = "train"
+
+    assert loader.collate_fn is not collate_fn
+    assert sorted(sample for batch in loader for sample in batch) == list(range(10))
+
+
+@pytest.mark.skipif(not (_TORCHVISION_AVAILABLE and _VISSL_AVAILABLE), reason="vissl not installed.")
+@pytest.mark.skipif(not hasattr(torch, "compile"), reason="torch.compile requires torch>=2.0.")
+def test_vissl_training_compile(tmpdir):
+    kwargs = dict(
+        training_strategy="barlow_twins",
+        head="simclr_head",
+        pretraining_transform="barlow_twins_transform",
+        training_strategy_kwargs={"latent_embedding_dim": 128},
+        pretraining_transform_kwargs={
+            "total_num_crops": 2,
+            "num_crops": [2],
+            "size_crops": [96],
+            "crop_scales": [[0.4, 1]],
+        },
+    )
+    embedder = ImageEmbedder(compile=True, **kwargs)
+
+    # only the ``forward`` methods are compiled, so checkpoints are interchangeable with eager models
+    assert embedder.state_dict().keys() == ImageEmbedder(**kwargs).state_dict().keys()
+
+    datamodule = ImageClassificationData.from_datasets(
+        train_dataset=FakeData(size=8),
+        batch_size=4,
+    )
+    trainer = flash.Trainer(max_steps=2, max_epochs=1, gpus=torch.cuda.device_count())
+    trainer.fit(embedder, datamodule=datamodule)
+
+
+@pytest.mark.skipif(not (_TORCHVISION_AVAILABLE and _VISSL_AVAILABLE), reason="vissl not installed.")
+def test_to_torchscript(tmpdir):
+    embedder = ImageEmbedder(
+        training_strategy="barlow_twins",
+        head="simclr_head",
+        pretraining_transform="barlow_twins_transform",
+        training_strategy_kwargs={"latent_embedding_dim": 128},
+    )
+    path = os.path.join(tmpdir, "backbone.pt")
+    batch = {DefaultDataKeys.INPUT: torch.rand(2, 3, 64, 64)}
+
+    module = embedder.to_torchscript(path, example_inputs=torch.rand(1, 3, 64, 64))
+    assert embedder._traced_backbone is module
+    assert os.path.exists(path)
+
+    with torch.no_grad():
+        expected = embedder.predict_step(batch, 0)
+    assert torch.allclose(torch.jit.load(path)(batch[DefaultDataKeys.INPUT]), expected, atol=1e-4)
+
+    # the frozen module is dropped when the weights are loaded again
+    embedder.load_state_dict(embedder.state_dict())
+    assert embedder._traced_backbone is None
+
+
+@pytest.mark.skipif(not (_TORCHVISION_AVAILABLE and _VISSL_AVAILABLE), reason="vissl not installed.")
+def test_precision_validation():
+    with pytest.raises(MisconfigurationException, match="`precision` should be either None or 'bf16'"):
+        ImageEmbedder(
+            training_strategy="barlow_twins",
+            head="simclr_head",
+            pretraining_transform="barlow_twins_transform",
+            precision="16",
+        )
+
+    embedder = ImageEmbedder(
+        training_strategy="barlow_twins",
+        head="simclr_head",
+        pretraining_transform="barlow_twins_transform",
+        precision="bf16-mixed",
+    )
+    assert embedder.autocast_precision == "bf16"
+
+
+@pytest.mark.skipif(not (_TORCHVISION_AVAILABLE and _VISSL_AVAILABLE), reason="vissl not installed.")
+@pytest.mark.skipif(not _TORCH_GREATER_EQUAL_1_10, reason="torch.autocast requires torch>=1.10.")
+def test_autocast():
+    embedder = ImageEmbedder(
+        training_strategy="barlow_twins",
+        head="simclr_head",
+        pretraining_transform="barlow_twins_transform",
+    )
+    # fake a GPU supporting bfloat16
+    embedder._device = torch.device("cuda", 0)
+
+    with mock.patch("torch.cuda.is_bf16_supported", return_value=True):
+        assert isinstance(embedder._autocast(), torch.autocast)
+
+        # the ``Trainer`` already runs in mixed precision
+        embedder.trainer = mock.MagicMock(precision=16)
+        assert not isinstance(embedder._autocast(), torch.autocast)
+
+        embedder.trainer = None
+        embedder.autocast_precision = None
+        assert not isinstance(embedder._autocast(), torch.autocast)
+
+    with mock.patch("torch.cuda.is_bf16_supported", return_value=False):
+        embedder.autocast_precision = "bf16"
+        assert not isinstance(embedder._autocast(), torch.autocast)
+
+
+def test_cached_registry_get():
+    registry = FlashRegistry("test")
+    registry(lambda: 0, name="zero")
+
+    ImageEmbedder.clear_registry_cache()
+    fn = ImageEmbedder._cached_get(registry, "zero")
+    assert ImageEmbedder._cached_get(registry, "zero") is fn
+
+    registry(lambda: 1, name="one")
+    assert ImageEmbedder._cached_get(registry, "one")() == 1
+    assert ImageEmbedder._cached_get(registry, "zero")() == 0
+
+    registry.remove("zero")
+    registry(lambda: 2, name="zero")
+    assert ImageEmbedder._cached_get(registry, "zero")() == 2
+
+    # unhashable metadata filters are not cached
+    registry(lambda: 3, name="three", sizes=[3])
+    assert ImageEmbedder._cached_get(registry, "three", sizes=[3])() == 3
+
+    # lookups on a garbage collected registry are dropped rather than returned for a new one with the same id
+    for idx in range(10):
+        registry = FlashRegistry("test")
+        registry(lambda idx=idx: idx, name="idx")
+        assert ImageEmbedder._cached_get(registry, "idx")() == idx
+    del registry
+    gc.collect()
+    assert len(ImageEmbedder.__registry_cache__) == 0
+
+    registry = FlashRegistry("test")
+    registry(lambda: 0, name="zero")
+    ImageEmbedder._cached_get(registry, "zero")
+    ImageEmbedder.clear_registry_cache()
+    assert len(ImageEmbedder.__registry_cache__) == 0
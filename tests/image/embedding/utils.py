@@ -1,7 +1,11 @@
+import os
+
+import numpy as np
+
 from flash.core.data.data_source import DefaultDataKeys
 from flash.core.data.process import DefaultPreprocess
 from flash.core.data.transforms import ApplyToKeys
-from flash.core.utilities.imports import _TORCHVISION_AVAILABLE, _VISSL_AVAILABLE
+from flash.core.utilities.imports import _PIL_AVAILABLE, _TORCHVISION_AVAILABLE, _VISSL_AVAILABLE
 from flash.image import ImageClassificationData
 from flash.image.embedding.vissl.transforms import multicrop_collate_fn
 
@@ -11,6 +15,9 @@ if _TORCHVISION_AVAILABLE:
 if _VISSL_AVAILABLE:
     from classy_vision.dataset.transforms import TRANSFORM_REGISTRY
 
+if _PIL_AVAILABLE:
+    from PIL import Image
+
 
 def ssl_datamodule(
     batch_size=2,
@@ -42,3 +49,14 @@ def ssl_datamodule(
     )
 
     return datamodule
+
+
+def image_folder(root, num_classes=2, num_images=4, size=(128, 128)):
+    """Write random JPEG images to one sub-folder of ``root`` per class and return ``root``."""
+    for class_idx in range(num_classes):
+        class_dir = os.path.join(root, f"class_{class_idx}")
+        os.makedirs(class_dir, exist_ok=True)
+        for image_idx in range(num_images):
+            image = Image.fromarray(np.random.randint(0, 255, (*size, 3), dtype="uint8"))
+            image.save(os.path.join(class_dir, f"{image_idx}.jpg"))
+    return str(root)
@@ -0,0 +1,92 @@
+# Copyright The PyTorch Lightning team.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import pytest
+
+TEST_CSV_DATA = """input,target
+this is a sentence one,this is a summarized sentence one
+this is a sentence two,this is a summarized sentence two
+this is a sentence three,this is a summarized sentence three
+"""
+
+TEST_JSON_DATA = """
+{"input": "this is a sentence one","target":"this is a summarized sentence one"}
+{"input": "this is a sentence two","target":"this is a summarized sentence two"}
+{"input": "this is a sentence three","target":"this is a summarized sentence three"}
+"""
+
+TEST_JSON_DATA_FIELD = """{"data": [
+{"input": "this is a sentence one","target":"this is a summarized sentence one"},
+{"input": "this is a sentence two","target":"this is a summarized sentence two"},
+{"input": "this is a sentence three","target":"this is a summarized sentence three"}]}
+"""
+
+
+@pytest.fixture(scope="session")
+def summarization_datadir(tmp_path_factory):
+    return tmp_path_factory.mktemp("summarization")
+
+
+@pytest.fixture(scope="session")
+def csv_path(summarization_datadir):
+    path = summarization_datadir / "data.csv"
+    path.write_text(TEST_CSV_DATA)
+    return path
+
+
+@pytest.fixture(scope="session")
+def json_path(summarization_datadir):
+    path = summarization_datadir / "data.json"
+    path.write_text(TEST_JSON_DATA)
+    return path
+
+
+@pytest.fixture(scope="session")
+def json_field_path(summarization_datadir):
+    path = summarization_datadir / "data_field.json"
+    path.write_text(TEST_JSON_DATA_FIELD)
+    return path
+
+
+@pytest.fixture(scope="session", params=["csv", "json", "json_field"])
+def summarization_dm(request, tiny_mbart):
+    """A ``SummarizationData`` with the train, val, and test files set, built once for each file format."""
+    from flash.text import SummarizationData
+
+    from_fn, path_fixture, kwargs = {
+        "csv": (SummarizationData.from_csv, "csv_path", {}),
+        "json": (SummarizationData.from_json, "json_path", {}),
+        "json_field": (SummarizationData.from_json, "json_field_path", {"field": "data"}),
+    }[request.param]
+    path = request.getfixturevalue(path_fixture)
+
+    return from_fn(
+        "input",
+        "target",
+        backbone="sshleifer/tiny-mbart",
+        tokenizer=tiny_mbart,
+        train_file=path,
+        val_file=path,
+        test_file=path,
+        batch_size=1,
+        src_lang="en_XX",
+        tgt_lang="ro_RO",
+        **kwargs,
+    )
+
+
+@pytest.fixture(scope="session")
+def tiny_mbart():
+    from transformers import AutoTokenizer
+
+    return AutoTokenizer.from_pretrained("sshleifer/tiny-mbart", use_fast=True, src_lang="en_XX", tgt_lang="ro_RO")
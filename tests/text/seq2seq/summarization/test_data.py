@@ -12,94 +12,34 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 import os
-from pathlib import Path
+import pickle
+from unittest import mock
 
 import pytest
 
 from flash.text import SummarizationData
+from flash.text.seq2seq.summarization.data import SummarizationPreprocess
 from tests.helpers.utils import _TEXT_TESTING
 
-TEST_BACKBONE = "sshleifer/tiny-mbart"  # super small model for testing
-
-TEST_CSV_DATA = """input,target
-this is a sentence one,this is a summarized sentence one
-this is a sentence two,this is a summarized sentence two
-this is a sentence three,this is a summarized sentence three
-"""
-
-TEST_JSON_DATA = """
-{"input": "this is a sentence one","target":"this is a summarized sentence one"}
-{"input": "this is a sentence two","target":"this is a summarized sentence two"}
-{"input": "this is a sentence three","target":"this is a summarized sentence three"}
-"""
-
-TEST_JSON_DATA_FIELD = """{"data": [
-{"input": "this is a sentence one","target":"this is a summarized sentence one"},
-{"input": "this is a sentence two","target":"this is a summarized sentence two"},
-{"input": "this is a sentence three","target":"this is a summarized sentence three"}]}
-"""
-
-
-def csv_data(tmpdir):
-    path = Path(tmpdir) / "data.csv"
-    path.write_text(TEST_CSV_DATA)
-    return path
-
-
-def json_data(tmpdir):
-    path = Path(tmpdir) / "data.json"
-    path.write_text(TEST_JSON_DATA)
-    return path
-
-
-def json_data_with_field(tmpdir):
-    path = Path(tmpdir) / "data.json"
-    path.write_text(TEST_JSON_DATA_FIELD)
-    return path
-
-
-@pytest.mark.skipif(os.name == "nt", reason="Huggingface timing out on Windows")
-@pytest.mark.skipif(not _TEXT_TESTING, reason="text libraries aren't installed.")
-def test_from_csv(tmpdir):
-    csv_path = csv_data(tmpdir)
-    dm = SummarizationData.from_csv(
-        "input", "target", backbone=TEST_BACKBONE, train_file=csv_path, batch_size=1, src_lang="en_XX", tgt_lang="ro_RO"
-    )
-    batch = next(iter(dm.train_dataloader()))
-    assert "labels" in batch
-    assert "input_ids" in batch
-
 
 @pytest.mark.skipif(os.name == "nt", reason="Huggingface timing out on Windows")
 @pytest.mark.skipif(not _TEXT_TESTING, reason="text libraries aren't installed.")
-def test_from_files(tmpdir):
-    csv_path = csv_data(tmpdir)
-    dm = SummarizationData.from_csv(
-        "input",
-        "target",
-        backbone=TEST_BACKBONE,
-        train_file=csv_path,
-        val_file=csv_path,
-        test_file=csv_path,
-        batch_size=1,
-        src_lang="en_XX",
-        tgt_lang="ro_RO",
-    )
-    batch = next(iter(dm.val_dataloader()))
-    assert "labels" in batch
-    assert "input_ids" in batch
-
-    batch = next(iter(dm.test_dataloader()))
-    assert "labels" in batch
-    assert "input_ids" in batch
+def test_dataloaders(summarization_dm):
+    for dataloader in (
+        summarization_dm.train_dataloader(),
+        summarization_dm.val_dataloader(),
+        summarization_dm.test_dataloader(),
+    ):
+        batch = next(iter(dataloader))
+        assert "labels" in batch
+        assert "input_ids" in batch
 
 
 @pytest.mark.skipif(not _TEXT_TESTING, reason="text libraries aren't installed.")
-def test_postprocess_tokenizer(tmpdir):
+def test_postprocess_tokenizer(csv_path):
     """Tests that the tokenizer property in ``SummarizationPostprocess`` resolves correctly when a different
     backbone is used."""
     backbone = "sshleifer/bart-tiny-random"
-    csv_path = csv_data(tmpdir)
     dm = SummarizationData.from_csv(
         "input", "target", backbone=backbone, train_file=csv_path, batch_size=1, src_lang="en_XX", tgt_lang="ro_RO"
     )
@@ -109,38 +49,15 @@ def test_postprocess_tokenizer(tmpdir):
     assert pipeline._postprocess_pipeline.tokenizer is not None
 
 
-@pytest.mark.skipif(os.name == "nt", reason="Huggingface timing out on Windows")
 @pytest.mark.skipif(not _TEXT_TESTING, reason="text libraries aren't installed.")
-def test_from_json(tmpdir):
-    json_path = json_data(tmpdir)
-    dm = SummarizationData.from_json(
-        "input",
-        "target",
-        backbone=TEST_BACKBONE,
-        train_file=json_path,
-        batch_size=1,
-        src_lang="en_XX",
-        tgt_lang="ro_RO",
-    )
-    batch = next(iter(dm.train_dataloader()))
-    assert "labels" in batch
-    assert "input_ids" in batch
+def test_pickle_tokenizer(tiny_mbart):
+    """Tests that a tokenizer passed to the preprocess is used by the data sources and the deserializer, and pickled
+    with them instead of being loaded from the backbone."""
+    with mock.patch("transformers.AutoTokenizer.from_pretrained") as from_pretrained:
+        preprocess = SummarizationPreprocess(backbone="sshleifer/bart-tiny-random", tokenizer=tiny_mbart)
 
+        for component in [*preprocess._data_sources.values(), preprocess.deserializer]:
+            component = pickle.loads(pickle.dumps(component))
+            assert component.tokenizer.get_vocab() == tiny_mbart.get_vocab()
 
-@pytest.mark.skipif(os.name == "nt", reason="Huggingface timing out on Windows")
-@pytest.mark.skipif(not _TEXT_TESTING, reason="text libraries aren't installed.")
-def test_from_json_with_field(tmpdir):
-    json_path = json_data_with_field(tmpdir)
-    dm = SummarizationData.from_json(
-        "input",
-        "target",
-        backbone=TEST_BACKBONE,
-        train_file=json_path,
-        batch_size=1,
-        field="data",
-        src_lang="en_XX",
-        tgt_lang="ro_RO",
-    )
-    batch = next(iter(dm.train_dataloader()))
-    assert "labels" in batch
-    assert "input_ids" in batch
+    from_pretrained.assert_not_called()